@@ -0,0 +1,108 @@
+# benchmarks/bench_booking_hot_event.py
+"""
+Bookings/sec for a single hot event with many concurrent writers.
+
+Every writer books one seat at a time through `database.bookings.book_seats` in its own
+session and transaction, until the event is sold out or the duration elapses.
+
+Usage (from the repository root, with the database of the configuration running):
+
+    PYTHONPATH=src python -m benchmarks.bench_booking_hot_event --writers 64 --seats 5000
+"""
+import argparse
+import asyncio
+import time
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.bookings import NotEnoughSeatsError, book_seats
+from database.engine import async_mysql_uri
+from database.schema import BookingORM, EventORM
+
+
+def hot_event(total_seats: int) -> EventORM:
+    now = datetime.now(tz=UTC)
+    return EventORM(
+        name=f"Benchmark hot event {now.timestamp()}",
+        start_location="Athens",
+        destination="Santorini",
+        departure_time_to=now,
+        arrival_time_to=now + timedelta(hours=4),
+        departure_time_return=now + timedelta(days=2),
+        arrival_time_return=now + timedelta(days=2, hours=4),
+        event_start_date=date.today(),
+        event_end_date=date.today() + timedelta(days=2),
+        reserved_seats=0,
+        total_seats=total_seats,
+        price_per_seat=Decimal("100.00"),
+    )
+
+
+async def writer(session_factory, event_id: int, deadline: float, counts: dict) -> None:
+    while time.perf_counter() < deadline:
+        async with session_factory() as session:
+            booking = BookingORM(event_id=event_id, seats=1, unit_price=Decimal("100.00"))
+            try:
+                await book_seats(session, booking)
+                await session.commit()
+                counts["booked"] += 1
+            except NotEnoughSeatsError:
+                await session.rollback()
+                counts["refused"] += 1
+                return
+
+
+async def run(writers: int, seats: int, duration: float) -> None:
+    engine = create_async_engine(async_mysql_uri, pool_size=writers, max_overflow=0)
+    session_factory = sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+    )
+
+    async with session_factory() as session:
+        event = hot_event(seats)
+        session.add(event)
+        await session.commit()
+        event_id = event.id_
+
+    counts = {"booked": 0, "refused": 0}
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(writer(session_factory, event_id, start + duration, counts) for _ in range(writers))
+        )
+        elapsed = time.perf_counter() - start
+
+        async with session_factory() as session:
+            reserved = await session.scalar(
+                select(EventORM.reserved_seats).where(EventORM.id_ == event_id)
+            )
+            booked = await session.scalar(
+                select(func.coalesce(func.sum(BookingORM.seats), 0)).where(
+                    BookingORM.event_id == event_id
+                )
+            )
+    finally:
+        async with session_factory() as session:
+            await session.delete(await session.get(EventORM, event_id))
+            await session.commit()
+        await engine.dispose()
+
+    print(f"writers:          {writers}")
+    print(f"elapsed:          {elapsed:.2f}s")
+    print(f"bookings:         {counts['booked']}")
+    print(f"refused:          {counts['refused']}")
+    print(f"bookings/sec:     {counts['booked'] / elapsed:.1f}")
+    print(f"consistent:       {reserved == booked <= seats} (reserved={reserved}, booked={booked})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bookings/sec on one hot event.")
+    parser.add_argument("--writers", type=int, default=64, help="Concurrent writers.")
+    parser.add_argument("--seats", type=int, default=5000, help="Total seats of the hot event.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Maximum seconds to run.")
+    args = parser.parse_args()
+    asyncio.run(run(args.writers, args.seats, args.duration))
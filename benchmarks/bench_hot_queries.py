@@ -0,0 +1,80 @@
+# benchmarks/bench_hot_queries.py
+"""
+Python-side cost of the hot lookups (user and admin by email, event by name), rebuilt as a new
+select() per call as the endpoints used to do, against the prebuilt statements of
+`database.queries`.
+
+The statements run against an in-memory SQLite database holding the users, admins and events
+tables, so that the time measured is the statement construction, the cache key generation, the
+compiled cache lookup and the ORM result processing, with next to no database time. Compiling
+each statement for MySQL is measured separately, it is what the compiled cache saves.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python -m benchmarks.bench_hot_queries --calls 20000
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from database.queries import ADMIN_BY_EMAIL, EVENT_BY_NAME, USER_BY_EMAIL
+from database.schema import AdminORM, EventORM, UserORM
+
+
+def rebuilt(session: Session, i: int) -> None:
+    session.execute(select(UserORM).filter_by(email=f"user{i}@example.com")).scalar_one_or_none()
+    session.execute(select(AdminORM).filter_by(email=f"admin{i}@example.com")).scalar_one_or_none()
+    session.execute(select(EventORM).filter_by(name=f"event {i}")).scalar_one_or_none()
+
+
+def prebuilt(session: Session, i: int) -> None:
+    session.execute(USER_BY_EMAIL, {"email": f"user{i}@example.com"}).scalar_one_or_none()
+    session.execute(ADMIN_BY_EMAIL, {"email": f"admin{i}@example.com"}).scalar_one_or_none()
+    session.execute(EVENT_BY_NAME, {"name": f"event {i}"}).scalar_one_or_none()
+
+
+def timed(lookups, session: Session, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        lookups(session, i)
+    return time.perf_counter() - start
+
+
+def compile_cost(calls: int) -> float:
+    dialect = mysql.dialect()
+    start = time.perf_counter()
+    for i in range(calls):
+        select(UserORM).filter_by(email=f"user{i}@example.com").compile(dialect=dialect)
+    return time.perf_counter() - start
+
+
+def run(calls: int, rounds: int) -> None:
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        for orm_class in (UserORM, AdminORM, EventORM):
+            orm_class.__table__.create(conn)
+
+    results = {}
+    with Session(engine) as session:
+        for label, lookups in (("select() per call", rebuilt), ("prebuilt", prebuilt)):
+            lookups(session, 0)  # warm the compiled cache up
+            results[label] = min(timed(lookups, session, calls) for _ in range(rounds))
+    compiled = min(compile_cost(calls) for _ in range(rounds))
+
+    print(f"calls:              {calls} x 3 lookups")
+    for label, elapsed in results.items():
+        print(f"{label:<18}  {elapsed / (3 * calls) * 1e6:6.2f}µs/lookup")
+    print(f"{'mysql compile':<18}  {compiled / calls * 1e6:6.2f}µs/statement (saved by the cache)")
+    speedup = results["select() per call"] / results["prebuilt"]
+    print(f"speedup:            {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the hot lookup statements.")
+    parser.add_argument("--calls", type=int, default=20_000, help="Iterations of the 3 lookups.")
+    parser.add_argument("--rounds", type=int, default=3, help="Repetitions, the best one is kept.")
+    args = parser.parse_args()
+    run(args.calls, args.rounds)
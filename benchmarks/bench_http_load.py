@@ -0,0 +1,334 @@
+# benchmarks/bench_http_load.py
+"""
+In-process load test of the reservation API.
+
+`reservations.main:app` is driven through `httpx.ASGITransport`, as the tests do, by
+`--concurrency` concurrent clients per scenario. Every scenario sends `--requests` requests and
+reports its throughput, error count and latency distribution (p50/p95/p99/max and a histogram).
+
+Scenarios: login, register, event_read (GET /events by name), event_list, event_batch, hold
+(POST /bookings/hold) and export (GET /exports/events).
+
+By default the app runs against a stand-in database, a SQLite file in a temporary directory, so
+that the suite runs anywhere and the numbers mostly measure the Python side of the API (routing,
+validation, serialization, caches, hashing). `--database configured` runs it against the MySQL
+database of the configuration instead, the rows it creates are deleted afterwards.
+
+The results can be saved as a JSON baseline and later runs compared against it, e.g. before and
+after a change:
+
+    PYTHONPATH=src python -m benchmarks.bench_http_load --save benchmarks/baselines/main.json
+    PYTHONPATH=src python -m benchmarks.bench_http_load --compare benchmarks/baselines/main.json
+
+A comparison exits with status 1 when a scenario lost more than `--tolerance` of its throughput
+or its p95 grew by more than `--tolerance`.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+from urllib.parse import quote
+
+from benchmarks.bench_login_event_latency import event_payload, percentile
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database.base import Base
+from database.engine import SessionLocal
+from database.routing import replica_router
+from reservations.main import app
+from reservations.security import password_hasher
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, float("inf"))
+
+SCENARIOS = ("login", "register", "event_read", "event_list", "event_batch", "hold", "export")
+
+PASSWORD = "bench-password"
+
+Scenario = Callable[[AsyncClient, int], Awaitable[Response]]
+
+
+async def use_standin_database(directory: str) -> AsyncEngine:
+    """Create the tables in a SQLite file and bind the sessions of the app to it."""
+    standin = create_async_engine(f"sqlite+aiosqlite:///{directory}/bench.sqlite")
+    async with standin.begin() as conn:
+        # Table by table, the DDL hooks of the metadata are MySQL only
+        for table in Base.metadata.sorted_tables:
+            await conn.run_sync(table.create)
+    SessionLocal.configure(bind=standin)
+    replica_router.primary = standin
+    return standin
+
+
+class Fixtures:
+    """The accounts and events the scenarios use, created through the API."""
+
+    def __init__(self, client: AsyncClient, events: int):
+        self.client = client
+        self.suffix = int(time.time())
+        self.user_email = f"bench.{self.suffix}@example.com"
+        self.event_names = [f"Load test event {self.suffix} {i}" for i in range(events)]
+        self.registered: list[str] = []
+        self.user_headers: dict = {}
+        self.admin_headers: dict = {}
+
+    def user(self, email: str) -> dict:
+        return {
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "password": PASSWORD,
+            "date_of_birth": "1990-01-01",
+            "email": email,
+            "phone": "6900000000",
+        }
+
+    async def create(self) -> None:
+        response = await self.client.post("/users/register", json=self.user(self.user_email))
+        response.raise_for_status()
+        self.registered.append(response.json()["access_token"])
+        self.user_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        admin = {
+            "first_name": "Bench",
+            "last_name": "Admin",
+            "email": f"bench.admin.{self.suffix}@example.com",
+            "password": PASSWORD,
+        }
+        response = await self.client.post("/admins/register", json=admin)
+        response.raise_for_status()
+        self.admin_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for name in self.event_names:
+            # Enough seats for every hold of the run
+            event = {**event_payload(name), "total_seats": 1_000_000}
+            response = await self.client.post(
+                "/events/register", json=event, headers=self.admin_headers
+            )
+            response.raise_for_status()
+
+    async def delete(self) -> None:
+        for name in self.event_names:
+            await self.client.delete(
+                f"/events/delete?event_name={quote(name)}", headers=self.admin_headers
+            )
+        for token in self.registered:
+            await self.client.delete(
+                "/users/delete_me", headers={"Authorization": f"Bearer {token}"}
+            )
+
+
+def scenarios(fixtures: Fixtures) -> dict[str, Scenario]:
+    credentials = {"email": fixtures.user_email, "password": PASSWORD}
+    names = fixtures.event_names
+
+    async def login(client: AsyncClient, _i: int) -> Response:
+        return await client.post("/users/login", json=credentials)
+
+    async def register(client: AsyncClient, i: int) -> Response:
+        email = f"bench.{fixtures.suffix}.{i}@example.com"
+        response = await client.post("/users/register", json=fixtures.user(email))
+        if response.status_code == 201:
+            fixtures.registered.append(response.json()["access_token"])
+        return response
+
+    async def event_read(client: AsyncClient, _i: int) -> Response:
+        return await client.get("/events", params={"event_name": random.choice(names)})
+
+    async def event_list(client: AsyncClient, _i: int) -> Response:
+        return await client.get("/events/", params={"limit": 50})
+
+    async def event_batch(client: AsyncClient, _i: int) -> Response:
+        return await client.post(
+            "/events/batch", json={"names": random.sample(names, min(10, len(names)))}
+        )
+
+    async def hold(client: AsyncClient, _i: int) -> Response:
+        booking = {"event_name": random.choice(names), "seats": 1}
+        return await client.post("/bookings/hold", json=booking, headers=fixtures.user_headers)
+
+    async def export(client: AsyncClient, _i: int) -> Response:
+        return await client.get("/exports/events", headers=fixtures.admin_headers)
+
+    return {
+        "login": login,
+        "register": register,
+        "event_read": event_read,
+        "event_list": event_list,
+        "event_batch": event_batch,
+        "hold": hold,
+        "export": export,
+    }
+
+
+def histogram(latencies_ms: list[float]) -> dict[str, int]:
+    counts = dict.fromkeys(BUCKETS_MS, 0)
+    for latency in latencies_ms:
+        counts[next(bound for bound in BUCKETS_MS if latency <= bound)] += 1
+    return {f"le_{bound:g}ms": count for bound, count in counts.items()}
+
+
+async def run_scenario(
+    client: AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> dict:
+    latencies_ms: list[float] = []
+    statuses: dict[int, int] = {}
+    next_request = iter(range(requests))
+
+    async def worker():
+        for i in next_request:
+            start = time.perf_counter()
+            response = await scenario(client, i)
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "throughput": round(requests / elapsed, 1),
+        **{f"p{pct}_ms": round(percentile(latencies_ms, pct), 2) for pct in (50, 95, 99)},
+        "max_ms": round(max(latencies_ms), 2),
+        "histogram": histogram(latencies_ms),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def report(results: dict) -> None:
+    print(
+        f"{'scenario':<12} {'req/s':>9} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    )
+    for name, stats in results["scenarios"].items():
+        print(
+            f"{name:<12} {stats['throughput']:>9.1f} {stats['errors']:>7} "
+            + " ".join(f"{stats[key]:>7.2f}ms" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+        )
+        buckets = (f"{bucket[3:]}:{count}" for bucket, count in stats["histogram"].items() if count)
+        print(f"{'':<12} {' '.join(buckets)}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the changes against `baseline`, False if a scenario regressed beyond `tolerance`."""
+    print(f"\nagainst {baseline['meta'].get('commit')} ({baseline['meta']['database']})")
+    ok = True
+    for name, stats in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        throughput = stats["throughput"] / before["throughput"] - 1
+        p95 = stats["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        regressed = throughput < -tolerance or p95 > tolerance
+        ok = ok and not regressed
+        print(
+            f"{name:<12} req/s {throughput:+7.1%}  p95 {p95:+7.1%}"
+            + ("  REGRESSION" if regressed else "")
+        )
+    return ok
+
+
+async def run(args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        standin = await use_standin_database(directory) if args.database == "standin" else None
+        transport = ASGITransport(app=app)
+        async with AsyncClient(base_url="http://bench", transport=transport) as client:
+            fixtures = Fixtures(client, events=args.events)
+            await fixtures.create()
+            try:
+                available = scenarios(fixtures)
+                results = {
+                    name: await run_scenario(
+                        client, available[name], args.requests, args.concurrency
+                    )
+                    for name in args.scenarios
+                }
+            finally:
+                await fixtures.delete()
+                if standin is not None:
+                    await standin.dispose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "database": args.database,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "hash_workers": password_hasher.max_workers,
+            "python": platform.python_version(),
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the reservation API in process.")
+    parser.add_argument(
+        "--database",
+        choices=("standin", "configured"),
+        default="standin",
+        help="SQLite stand-in in a temporary directory, or the configured MySQL database.",
+    )
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario.")
+    parser.add_argument("--events", type=int, default=20, help="Events created for the reads.")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"Comma separated scenarios to run, among {','.join(SCENARIOS)}.",
+    )
+    parser.add_argument(
+        "--hash-workers",
+        type=int,
+        default=password_hasher.max_workers,
+        help="Hashing worker processes, 0 hashes inline in the event loop.",
+    )
+    parser.add_argument("--save", type=Path, help="Write the results as a JSON baseline.")
+    parser.add_argument("--compare", type=Path, help="JSON baseline to compare the results to.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Relative regression allowed by --compare."
+    )
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    password_hasher.max_workers = args.hash_workers
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        password_hasher.shutdown()
+
+    report(results)
+    if args.save is not None:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nsaved to {args.save}")
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/bench_login_event_latency.py
+"""
+Latency of `GET /events` while logins are hammering the same worker.
+
+The app is driven in-process through `httpx.ASGITransport`, so logins and event reads share one
+event loop exactly as they share a uvicorn worker. Run it once with `--hash-workers 0` (argon2
+inline, blocking the loop) and once with the process pool to compare the p99 of the reads.
+
+Usage (from the repository root, with the database of the configuration running):
+
+    PYTHONPATH=src python -m benchmarks.bench_login_event_latency --logins 32 --hash-workers 2
+"""
+import argparse
+import asyncio
+import time
+from urllib.parse import quote
+
+from httpx import ASGITransport, AsyncClient
+
+from reservations.main import app
+from reservations.security import password_hasher
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def event_payload(name: str) -> dict:
+    return {
+        "name": name,
+        "description": "Benchmark event",
+        "start_location": "Athens",
+        "destination": "Santorini",
+        "departure_time_to": "2025-08-15T08:00:00+03:00",
+        "arrival_time_to": "2025-08-15T12:00:00+03:00",
+        "departure_time_return": "2025-08-17T17:00:00+03:00",
+        "arrival_time_return": "2025-08-17T21:00:00+03:00",
+        "event_start_date": "2025-08-15",
+        "event_end_date": "2025-08-17",
+        "total_seats": 30,
+        "price_per_seat": "120.00",
+    }
+
+
+async def login_loop(client: AsyncClient, credentials: dict, deadline: float, counts: dict):
+    while time.perf_counter() < deadline:
+        response = await client.post("/users/login", json=credentials)
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+
+async def read_loop(client: AsyncClient, url: str, deadline: float, latencies: list[float]):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(url)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+
+
+async def run(logins: int, readers: int, duration: float) -> None:
+    suffix = int(time.time())
+    user = {
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "password": "bench-password",
+        "date_of_birth": "1990-01-01",
+        "email": f"bench.{suffix}@example.com",
+        "phone": "6900000000",
+    }
+    admin = {
+        "first_name": "Bench",
+        "last_name": "Admin",
+        "email": f"bench.admin.{suffix}@example.com",
+        "password": "bench-password",
+    }
+    event_name = f"Benchmark event {suffix}"
+
+    async with AsyncClient(base_url="http://bench", transport=ASGITransport(app=app)) as client:
+        response = await client.post("/users/register", json=user)
+        user_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = await client.post("/admins/register", json=admin)
+        admin_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        await client.post("/events/register", json=event_payload(event_name), headers=admin_headers)
+        url = f"/events?event_name={quote(event_name)}"
+
+        counts: dict[int, int] = {}
+        latencies: list[float] = []
+        try:
+            deadline = time.perf_counter() + duration
+            credentials = {"email": user["email"], "password": user["password"]}
+            await asyncio.gather(
+                *(login_loop(client, credentials, deadline, counts) for _ in range(logins)),
+                *(read_loop(client, url, deadline, latencies) for _ in range(readers)),
+            )
+        finally:
+            await client.delete(
+                f"/events/delete?event_name={quote(event_name)}", headers=admin_headers
+            )
+            await client.delete("/users/delete_me", headers=user_headers)
+            password_hasher.shutdown()
+
+    print(f"hash workers:     {password_hasher.max_workers}")
+    print(f"login responses:  {dict(sorted(counts.items()))}")
+    print(f"logins/sec:       {counts.get(200, 0) / duration:.1f}")
+    print(f"event reads:      {len(latencies)}")
+    for pct in (50, 95, 99):
+        print(f"GET /events p{pct}:  {percentile(latencies, pct) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark event reads during a login burst.")
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent login loops.")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent GET /events loops.")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run.")
+    parser.add_argument(
+        "--hash-workers",
+        type=int,
+        default=password_hasher.max_workers,
+        help="Hashing worker processes, 0 hashes inline in the event loop.",
+    )
+    args = parser.parse_args()
+    password_hasher.max_workers = args.hash_workers
+    asyncio.run(run(args.logins, args.readers, args.duration))
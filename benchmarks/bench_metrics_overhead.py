@@ -0,0 +1,81 @@
+# benchmarks/bench_metrics_overhead.py
+"""
+Per-request overhead of `MetricsMiddleware`: a minimal ASGI app (it marks the request as routed
+and sends an empty 200 response) is called directly, without and with the middleware around it,
+and the difference per request is compared to the budget. The cost of rendering the registry
+for a scrape is reported too.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python -m benchmarks.bench_metrics_overhead --requests 100000
+
+Exits with status 1 when the overhead exceeds `--budget-us` microseconds per request.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from reservations.metrics import MetricsMiddleware, registry
+
+# Route templates the requests are spread over, as the router would set them in the scope
+ROUTES = [SimpleNamespace(path=path) for path in ("/events", "/events/", "/bookings/hold")]
+
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b""}
+
+
+async def app(scope, _receive, send) -> None:
+    scope["route"] = ROUTES[scope["i"] % len(ROUTES)]
+    await send(START)
+    await send(BODY)
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(_message) -> None:
+    pass
+
+
+async def drive(asgi, requests: int) -> float:
+    scopes = [{"type": "http", "method": "GET", "path": "/", "i": i} for i in range(requests)]
+    start = time.perf_counter()
+    for scope in scopes:
+        await asgi(scope, receive, send)
+    return time.perf_counter() - start
+
+
+async def run(requests: int, rounds: int) -> float:
+    metered = MetricsMiddleware(app)
+    await drive(metered, 1_000)  # allocate the series of the routes
+    bare = min([await drive(app, requests) for _ in range(rounds)])
+    wrapped = min([await drive(metered, requests) for _ in range(rounds)])
+    overhead_us = (wrapped - bare) / requests * 1e6
+
+    start = time.perf_counter()
+    body = registry.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    print(f"requests: {requests}, best of {rounds} rounds")
+    print(f"  without middleware {bare / requests * 1e6:8.2f}µs/request")
+    print(f"  with middleware    {wrapped / requests * 1e6:8.2f}µs/request")
+    print(f"  overhead           {overhead_us:8.2f}µs/request")
+    print(f"  scrape             {render_ms:8.2f}ms ({len(body)} bytes)")
+    return overhead_us
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the overhead of the request metrics.")
+    parser.add_argument("--requests", type=int, default=100_000, help="Requests per round.")
+    parser.add_argument("--rounds", type=int, default=5, help="Repetitions, the best one is kept.")
+    parser.add_argument(
+        "--budget-us", type=float, default=20.0, help="Overhead allowed per request."
+    )
+    args = parser.parse_args()
+    overhead = asyncio.run(run(args.requests, args.rounds))
+    if overhead > args.budget_us:
+        print(f"over the budget of {args.budget_us}µs/request")
+        sys.exit(1)
@@ -0,0 +1,121 @@
+# benchmarks/bench_serialization.py
+"""
+Cost of rendering the responses of the hot endpoints, per response type, through the default
+FastAPI path (validation against the `response_model`, `jsonable_encoder`, stdlib json) against
+`ModelResponse` (pydantic-core in one step) and, when it is installed, orjson on the dumped
+model.
+
+Every path starts from an already validated response model, as the endpoints build them, and
+ends with the response object holding the bytes of the body.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python -m benchmarks.bench_serialization --calls 20000
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import BaseModel
+
+from models.responses import EventResponse, Page, TokenResponse, UserResponse
+from reservations.rendering import ModelResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+NOW = datetime(2025, 8, 1, 9, 30, tzinfo=timezone.utc)
+
+EVENT = EventResponse(
+    id_=1,
+    name="Beach Getaway",
+    description="Relaxing weekend trip to the beach.",
+    start_location="Athens",
+    destination="Santorini",
+    departure_time_to=NOW,
+    arrival_time_to=NOW,
+    departure_time_return=NOW,
+    arrival_time_return=NOW,
+    event_start_date=date(2025, 8, 15),
+    event_end_date=date(2025, 8, 17),
+    reserved_seats=15,
+    total_seats=30,
+    price_per_seat=Decimal("120.00"),
+    created_at=NOW,
+    updated_at=NOW,
+)
+USER = UserResponse(
+    id_=1,
+    first_name="Maria",
+    last_name="Papadopoulou",
+    password="$argon2id$v=19$m=65536,t=3,p=4$hash",
+    date_of_birth=date(1992, 5, 17),
+    email="maria@example.com",
+    phone="6901234567",
+    created_at=NOW,
+    updated_at=NOW,
+)
+TOKEN = TokenResponse(access_token="header.payload.signature" * 8, user=USER)
+PAGE = Page[EventResponse](items=[EVENT] * 50, next_cursor="MjAyNS0wOC0wMVQwOTozMDowMHwx")
+
+CASES = {
+    "EventResponse": EVENT,
+    "UserResponse": USER,
+    "TokenResponse": TOKEN,
+    "Page[EventResponse] x50": PAGE,
+}
+
+
+async def fastapi_default(field, model: BaseModel) -> bytes:
+    content = await serialize_response(field=field, response_content=model)
+    return JSONResponse(content).body
+
+
+async def model_response(_field, model: BaseModel) -> bytes:
+    return ModelResponse(model).body
+
+
+async def orjson_dump(_field, model: BaseModel) -> bytes:
+    return Response(orjson.dumps(model.model_dump(mode="json")), media_type="application/json").body
+
+
+async def timed(render, field, model: BaseModel, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await render(field, model)
+    return time.perf_counter() - start
+
+
+async def run(calls: int, rounds: int) -> None:
+    renders = {"fastapi default": fastapi_default, "ModelResponse": model_response}
+    if orjson is not None:
+        renders["orjson"] = orjson_dump
+
+    print(f"calls: {calls} per response type, best of {rounds} rounds")
+    for label, model in CASES.items():
+        field = create_model_field(name="response", type_=type(model), mode="serialization")
+        bodies = {name: await render(field, model) for name, render in renders.items()}
+        results = {
+            name: min([await timed(render, field, model, calls) for _ in range(rounds)])
+            for name, render in renders.items()
+        }
+        same = bodies["ModelResponse"] == bodies["fastapi default"]
+        print(f"\n{label} ({len(bodies['ModelResponse'])} bytes, same body: {same})")
+        for name, elapsed in results.items():
+            speedup = results["fastapi default"] / elapsed
+            print(f"  {name:<16} {elapsed / calls * 1e6:8.2f}µs/response  {speedup:5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the response serialization paths.")
+    parser.add_argument("--calls", type=int, default=20_000, help="Renders per response type.")
+    parser.add_argument("--rounds", type=int, default=3, help="Repetitions, the best one is kept.")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.rounds))
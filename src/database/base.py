@@ -1,7 +1,7 @@
 # src/database.py
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any, Callable, Type, TypeVar
 
 from sqlalchemy import DDL, TIMESTAMP, event, text
@@ -9,6 +9,12 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 current_timestamp = text("CURRENT_TIMESTAMP")
 
+
+def utc_now() -> datetime:
+    # Whole seconds, as stored by TIMESTAMP columns, so that the in-memory value matches the row
+    return datetime.now(tz=UTC).replace(microsecond=0)
+
+
 T = TypeVar("T")
 
 
@@ -81,15 +87,18 @@ class TimestampBase(Base):
     **Notes about the behaviour of the class**
      - All timestamps are automatically converted to UTC before being stored in the database
      - Timezone-aware handling ensures consistent behavior across different geographic locations
+     - The timestamps of new rows are set client side, so that inserted objects need no refresh
+       to read them (the server defaults remain for rows inserted outside the ORM)
     """
 
     __abstract__ = True
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, server_default=current_timestamp, nullable=False
+        TIMESTAMP, default=utc_now, server_default=current_timestamp, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP,
+        default=utc_now,
         server_default=current_timestamp,
         server_onupdate=current_timestamp,
         nullable=False,
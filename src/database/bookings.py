@@ -0,0 +1,190 @@
+# src/database/bookings.py
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import Update, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.schema import BookingORM, EventORM
+from src.enumerations import BookingStatus
+
+__all__ = [
+    "NotEnoughSeatsError",
+    "reserve_seats",
+    "release_seats",
+    "book_seats",
+    "hold_seats",
+    "confirm_hold",
+    "release_expired_holds",
+]
+
+
+class NotEnoughSeatsError(Exception):
+    """Raised when an event does not have enough available seats for a booking."""
+
+
+def reserve_seats(event_id: int, seats: int) -> Update:
+    """
+    Build the conditional UPDATE that checks the capacity of an event and increments its
+    reserved seats in a single statement.
+
+    The row only matches when enough seats are left, so an affected row count of zero means
+    the reservation must be refused. The statement is atomic in MySQL, there is no window
+    between reading and writing `reserved_seats` as there was with the booking triggers.
+
+    Parameters:
+        event_id (int): The id of the event to reserve seats for.
+        seats (int): The number of seats to reserve.
+
+    Returns:
+        Update: The UPDATE statement. Identity map objects are not synchronized.
+    """
+    return (
+        update(EventORM)
+        .where(EventORM.id_ == event_id, EventORM.total_seats - EventORM.reserved_seats >= seats)
+        .values(reserved_seats=EventORM.reserved_seats + seats)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_seats(event_id: int, seats: int) -> Update:
+    """
+    Build the UPDATE that gives reserved seats of an event back, in a single statement.
+
+    Parameters:
+        event_id (int): The id of the event to release seats for.
+        seats (int): The number of seats to release.
+
+    Returns:
+        Update: The UPDATE statement. Identity map objects are not synchronized.
+    """
+    return (
+        update(EventORM)
+        .where(EventORM.id_ == event_id, EventORM.reserved_seats >= seats)
+        .values(reserved_seats=EventORM.reserved_seats - seats)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def book_seats(session: AsyncSession, booking: BookingORM) -> BookingORM:
+    """
+    Reserve the seats of a booking and insert it within the transaction of the session.
+
+    The conditional UPDATE runs before the INSERT, so the exclusive lock on the event row is
+    taken first and the foreign key check of the INSERT does not have to upgrade a shared lock
+    (which deadlocks under concurrent writers). The caller owns the transaction and must commit
+    promptly, the event row stays locked until then.
+
+    Raises:
+        ValueError: If the booking does not request a positive number of seats.
+        NotEnoughSeatsError: If the event does not exist or does not have enough seats left.
+
+    Returns:
+        BookingORM: The flushed booking, with its id populated.
+    """
+    if booking.seats is None or booking.seats <= 0:
+        raise ValueError("A booking must reserve at least one seat.")
+
+    result = await session.execute(reserve_seats(booking.event_id, booking.seats))
+    if result.rowcount != 1:
+        raise NotEnoughSeatsError("Not enough available seats for this event.")
+
+    session.add(booking)
+    await session.flush()
+    return booking
+
+
+async def hold_seats(session: AsyncSession, booking: BookingORM, ttl: timedelta) -> BookingORM:
+    """
+    Place a time-limited hold: the seats are reserved and the booking is inserted as PENDING
+    with an expiry timestamp. The caller should commit right away, so that no lock on the
+    event row is kept while the hold waits for its confirmation.
+
+    Raises:
+        NotEnoughSeatsError: If the event does not have enough seats left.
+
+    Returns:
+        BookingORM: The flushed pending booking.
+    """
+    booking.status = BookingStatus.PENDING
+    booking.expires_at = datetime.now(tz=UTC) + ttl
+    return await book_seats(session, booking)
+
+
+async def confirm_hold(session: AsyncSession, booking_id: int, user_id: int) -> bool:
+    """
+    Flip a pending, unexpired hold of a user to ACTIVE.
+
+    The update is conditional, so a hold that the sweeper has already released (or that has
+    expired but not been swept yet) can not be confirmed.
+
+    Returns:
+        bool: True if the hold was confirmed, False otherwise.
+    """
+    result = await session.execute(
+        update(BookingORM)
+        .where(
+            BookingORM.id_ == booking_id,
+            BookingORM.user_id == user_id,
+            BookingORM.status == BookingStatus.PENDING,
+            BookingORM.expires_at > datetime.now(tz=UTC),
+        )
+        .values(status=BookingStatus.ACTIVE, expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def release_expired_holds(
+    session: AsyncSession,
+    batch_size: int,
+    on_release: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Cancel up to `batch_size` expired holds and give their seats back to the events, in one
+    transaction which is committed before returning. `on_release` is called after the commit
+    with the id of every event that got seats back, e.g. to invalidate cached seat counters.
+
+    Expired holds are locked with SKIP LOCKED, so concurrent sweepers (one per worker) split
+    the work instead of waiting on each other, and a hold that is being confirmed is skipped.
+
+    Returns:
+        int: The number of holds released.
+    """
+    # READ COMMITTED takes no gap locks on the status/expiry index, so new holds are not blocked
+    await session.connection(execution_options={"isolation_level": "READ COMMITTED"})
+    result = await session.execute(
+        select(BookingORM.id_, BookingORM.event_id, BookingORM.seats)
+        .where(
+            BookingORM.status == BookingStatus.PENDING,
+            BookingORM.expires_at <= datetime.now(tz=UTC),
+        )
+        .order_by(BookingORM.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    expired = result.all()
+    if not expired:
+        await session.rollback()
+        return 0
+
+    await session.execute(
+        update(BookingORM)
+        .where(BookingORM.id_.in_([booking_id for booking_id, _, _ in expired]))
+        .values(status=BookingStatus.CANCELLED)
+        .execution_options(synchronize_session=False)
+    )
+
+    seats_per_event = Counter()
+    for _, event_id, seats in expired:
+        seats_per_event[event_id] += seats
+    # Sorted to lock the event rows in a consistent order across sweepers
+    for event_id, seats in sorted(seats_per_event.items()):
+        await session.execute(release_seats(event_id, seats))
+
+    await session.commit()
+    if on_release is not None:
+        for event_id in seats_per_event:
+            on_release(event_id)
+    return len(expired)
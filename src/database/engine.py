@@ -1,14 +1,15 @@
 # src/database/engine.py
 from icecream import ic
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from configs import DBConfig, bool_
-from pyutils.logging import configure_loggers
+from database.pool import MeteredQueuePool, ping_idle_connections
+from pyutils.logging import SlowQueryLog, configure_loggers
 
 configure_loggers(directory="configurations", filename="logger_config.yaml")
 
-__all__ = ["engine", "SessionLocal", "async_mysql_uri"]
+__all__ = ["engine", "replica_engines", "SessionLocal", "async_mysql_uri", "slow_queries"]
 
 username = DBConfig.user.get("username")
 password = DBConfig.user.get("password")
@@ -18,7 +19,48 @@ echo = DBConfig.service.get("echo", default=False, cast=bool_)
 database = DBConfig.service.get("database")
 
 async_mysql_uri = ic(f"mysql+aiomysql://{username}:{password}@{host}:{port}/{database}")
-engine = create_async_engine(async_mysql_uri, echo=echo, pool_pre_ping=True)
+
+# Pool sizing, a worker holds at most pool_size + max_overflow connections
+# liveness: "pre_ping" pings on every checkout, "idle_ping" only connections idle for more than
+# liveness_idle_seconds, "none" relies on pool_recycle (keep it below the server wait_timeout)
+liveness = DBConfig.service.get("liveness", default="idle_ping")
+if liveness not in ("pre_ping", "idle_ping", "none"):
+    raise ValueError(f"Invalid liveness strategy: {liveness}")
+liveness_idle_seconds = DBConfig.service.get("liveness_idle_seconds", default=30, cast=float)
+pool_options = {
+    "poolclass": MeteredQueuePool,
+    "pool_size": DBConfig.service.get("pool_size", default=5, cast=int),
+    "max_overflow": DBConfig.service.get("max_overflow", default=10, cast=int),
+    "pool_recycle": DBConfig.service.get("pool_recycle", default=1800, cast=int),
+    "pool_timeout": DBConfig.service.get("pool_timeout", default=30, cast=float),
+    "pool_pre_ping": liveness == "pre_ping",
+}
+
+# Statements whose execution takes longer are logged by the database.slow_queries logger
+slow_query_threshold_ms = DBConfig.service.get("slow_query_threshold_ms", default=100, cast=float)
+slow_queries = SlowQueryLog(threshold_seconds=slow_query_threshold_ms / 1000)
+
+
+def build_engine(uri: str) -> AsyncEngine:
+    eng = create_async_engine(uri, echo=echo, **pool_options)
+    if liveness == "idle_ping":
+        ping_idle_connections(eng, liveness_idle_seconds)
+    slow_queries.register(eng.sync_engine)
+    return eng
+
+
+engine = build_engine(async_mysql_uri)
+
+# Read replicas, as host or host:port, they share the credentials and the database of the primary
+replica_hosts = [
+    h.strip() for h in DBConfig.replicas.get("hosts", default="").split(",") if h.strip()
+]
+replica_engines = [
+    build_engine(
+        f"mysql+aiomysql://{username}:{password}@{h if ':' in h else f'{h}:{port}'}/{database}"
+    )
+    for h in replica_hosts
+]
 
 
 SessionLocal: sessionmaker[AsyncSession] = sessionmaker(  # type: ignore
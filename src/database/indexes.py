@@ -0,0 +1,204 @@
+# src/database/indexes.py
+"""
+Registry of the indexes declared on the ORM models and its check against the live schema.
+
+The indexes are declared where the tables are, in the `__table_args__` of the models of
+`database.schema`, together with the unique and primary keys. The live indexes are read from
+`information_schema.STATISTICS`, the usage of each index from the performance schema.
+
+Usage (from the repository root):
+
+    PYTHONPATH=src python -m database.indexes [--create]
+"""
+import argparse
+import asyncio
+import logging
+from typing import NamedTuple, Optional
+
+from sqlalchemy import (
+    Connection,
+    MetaData,
+    PrimaryKeyConstraint,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from configs import DBConfig
+from database.base import Base
+from database.utils import create_index_if_not_exists
+
+__all__ = [
+    "IndexSpec",
+    "IndexReport",
+    "declared_indexes",
+    "live_indexes",
+    "unused_indexes",
+    "create_missing_indexes",
+    "check_indexes",
+    "verify_indexes",
+]
+
+logger = logging.getLogger(__name__)
+
+DATABASE = DBConfig.service.get("database")
+
+
+class IndexSpec(NamedTuple):
+    table: str
+    name: str
+    columns: tuple[str, ...]
+    unique: bool
+
+
+class IndexReport(NamedTuple):
+    missing: list[IndexSpec]
+    undeclared: list[IndexSpec]
+    unused: list[IndexSpec]
+
+
+def declared_indexes(
+    metadata: MetaData = Base.metadata, tables: Optional[list[str]] = None
+) -> dict[tuple[str, str], IndexSpec]:
+    """
+    Collect the indexes the models declare, keyed by (table, index name).
+
+    Besides the `Index` objects of `__table_args__`, primary keys and unique constraints are
+    indexes too. MySQL names them PRIMARY and, when unnamed, after their first column.
+    """
+    specs = {}
+    for table in metadata.sorted_tables:
+        if tables and table.name not in tables:
+            continue
+        for index in table.indexes:
+            columns = tuple(column.name for column in index.columns)
+            specs[(table.name, index.name)] = IndexSpec(
+                table.name, index.name, columns, index.unique
+            )
+        for constraint in table.constraints:
+            columns = tuple(column.name for column in constraint.columns)
+            if isinstance(constraint, PrimaryKeyConstraint):
+                specs[(table.name, "PRIMARY")] = IndexSpec(table.name, "PRIMARY", columns, True)
+            elif isinstance(constraint, UniqueConstraint):
+                name = constraint.name or columns[0]
+                specs[(table.name, name)] = IndexSpec(table.name, name, columns, True)
+    return specs
+
+
+def live_indexes(conn: Connection, schema: str = DATABASE) -> dict[tuple[str, str], IndexSpec]:
+    """Read the indexes of `schema` from information_schema, keyed by (table, index name)."""
+    rows = conn.execute(
+        text(
+            "SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME "
+            "FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = :schema "
+            "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+        ),
+        {"schema": schema},
+    )
+    specs = {}
+    for table, name, non_unique, column in rows:
+        spec = specs.get((table, name))
+        columns = (spec.columns if spec else ()) + (column,)
+        specs[(table, name)] = IndexSpec(table, name, columns, not non_unique)
+    return specs
+
+
+def unused_indexes(conn: Connection, schema: str = DATABASE) -> set[tuple[str, str]]:
+    """
+    The (table, index name) pairs of `schema` that no statement has read or written through
+    since the server started, according to the performance schema.
+    """
+    rows = conn.execute(
+        text(
+            "SELECT OBJECT_NAME, INDEX_NAME "
+            "FROM performance_schema.table_io_waits_summary_by_index_usage "
+            "WHERE OBJECT_SCHEMA = :schema AND INDEX_NAME IS NOT NULL AND COUNT_STAR = 0"
+        ),
+        {"schema": schema},
+    )
+    return {(table, name) for table, name in rows}
+
+
+def create_missing_indexes(conn: Connection, metadata: MetaData = Base.metadata) -> list[IndexSpec]:
+    """Create the declared indexes that do not exist in the live schema, return them."""
+    live = live_indexes(conn)
+    created = []
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            if (table.name, index.name) in live:
+                continue
+            columns = [column.name for column in index.columns]
+            create_index_if_not_exists(conn, table, columns, index.name, unique=index.unique)
+            created.append(IndexSpec(table.name, index.name, tuple(columns), index.unique))
+    return created
+
+
+def check_indexes(conn: Connection, metadata: MetaData = Base.metadata) -> IndexReport:
+    """
+    Compare the declared indexes with the live schema.
+
+    An index is missing when it does not exist or has other columns than declared. Undeclared
+    indexes exist only in the database (e.g. added by hand, or by MySQL for a foreign key without
+    a usable index). Unused indexes are the non unique ones the performance schema has no reads
+    or writes for, unique indexes are never reported since they enforce a constraint.
+    """
+    declared = declared_indexes(metadata)
+    live = {key: spec for key, spec in live_indexes(conn).items() if spec.table in metadata.tables}
+    idle = unused_indexes(conn)
+    return IndexReport(
+        missing=[spec for key, spec in declared.items() if live.get(key) != spec],
+        undeclared=[spec for key, spec in live.items() if key not in declared],
+        unused=[spec for key, spec in live.items() if key in idle and not spec.unique],
+    )
+
+
+async def verify_indexes(eng: AsyncEngine) -> list[IndexSpec]:
+    """Log a warning for every declared index missing from the live schema, return them."""
+    async with eng.connect() as conn:
+        report = await conn.run_sync(check_indexes)
+    for spec in report.missing:
+        logger.warning(
+            "Index %s on %s(%s) is missing or differs from its declaration",
+            spec.name,
+            spec.table,
+            ", ".join(spec.columns),
+        )
+    return report.missing
+
+
+def _print_section(title: str, specs: list[IndexSpec]) -> None:
+    print(f"{title}: {len(specs)}")
+    for spec in specs:
+        unique = " UNIQUE" if spec.unique else ""
+        print(f"  {spec.table}.{spec.name}{unique} ({', '.join(spec.columns)})")
+
+
+async def main(eng: AsyncEngine, create: bool) -> None:
+    try:
+        if create:
+            async with eng.begin() as conn:
+                for spec in await conn.run_sync(create_missing_indexes):
+                    print(f"Created index {spec.table}.{spec.name} ({', '.join(spec.columns)})")
+        async with eng.connect() as conn:
+            report = await conn.run_sync(check_indexes)
+    finally:
+        await eng.dispose()
+
+    _print_section("Missing indexes", report.missing)
+    _print_section("Undeclared indexes", report.undeclared)
+    _print_section("Unused indexes (since the server started)", report.unused)
+
+
+if __name__ == "__main__":
+    import database.schema  # noqa: F401 (registers the models)
+    from database.engine import engine
+
+    parser = argparse.ArgumentParser(
+        description="Report declared indexes missing from the database and unused indexes."
+    )
+    parser.add_argument(
+        "--create", action="store_true", help="Create the missing indexes before reporting."
+    )
+    args = parser.parse_args()
+    asyncio.run(main(engine, args.create))
@@ -0,0 +1,132 @@
+# src/database/pool.py
+import time
+from typing import Any, Union
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+__all__ = [
+    "PoolMetrics",
+    "MeteredPoolMixin",
+    "MeteredQueuePool",
+    "ping_idle_connections",
+    "pool_stats",
+]
+
+
+class PoolMetrics:
+    """
+    Description
+
+    Counters of the checkouts of a connection pool. The wait of a checkout lasts from the request
+    of a connection until the pool hands one out, it includes the wait for a connection to be
+    checked in when the pool is exhausted, the connect time of new connections and liveness
+    checks.
+
+    Attributes
+
+    checkouts (int):
+        The checkouts that returned a connection.
+
+    timeouts (int):
+        The checkouts that gave up after `pool_timeout` seconds.
+
+    wait_seconds_total, wait_seconds_max (float):
+        The total and the longest wait of the checkouts, timed out ones included.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, wait_seconds: float, timed_out: bool) -> None:
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+class MeteredPoolMixin:
+    """Records the wait and the timeouts of every checkout of a queue pool in `metrics`."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # Engine.dispose() replaces the pool, the counters carry over
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.observe(time.perf_counter() - start, timed_out)
+
+
+class MeteredQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    """The pool of the async engines, with checkout metrics."""
+
+
+def ping_idle_connections(eng: Union[Engine, AsyncEngine], idle_seconds: float) -> None:
+    """
+    Ping a connection on checkout only if it sat idle in the pool for more than `idle_seconds`,
+    a cheaper liveness check than `pool_pre_ping`, which pings on every checkout. A connection
+    that fails the ping is discarded and the pool checks out another one. Connections that die
+    while in frequent use surface as errors instead, `pool_recycle` should stay below the
+    `wait_timeout` of the server so that these are rare.
+    """
+    sync_engine = eng.sync_engine if isinstance(eng, AsyncEngine) else eng
+
+    @event.listens_for(sync_engine, "checkin")
+    def record_checkin(_dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def ping_if_idle(dbapi_connection, connection_record, _connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            dbapi_connection.ping(False)
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+
+
+def pool_stats(eng: Union[Engine, AsyncEngine]) -> dict[str, Any]:
+    """Occupancy and checkout metrics of the pool of `eng`."""
+    pool: Pool = eng.pool
+    stats: dict[str, Any] = {"host": eng.url.host}
+    if hasattr(pool, "size"):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts the connections not opened yet as negative overflow
+            overflow=max(pool.overflow(), 0),
+            timeout_seconds=pool.timeout(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            checkout_timeouts=metrics.timeouts,
+            checkout_wait_seconds_total=metrics.wait_seconds_total,
+            checkout_wait_seconds_max=metrics.wait_seconds_max,
+        )
+    return stats
@@ -0,0 +1,134 @@
+# src/database/queries.py
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import (
+    CompoundSelect,
+    Integer,
+    Select,
+    String,
+    bindparam,
+    literal,
+    null,
+    select,
+    union_all,
+)
+
+from database.schema import AdminORM, EventORM, UserORM
+from src.enumerations import EventStatus, Role
+
+__all__ = [
+    "USER_BY_EMAIL",
+    "ADMIN_BY_EMAIL",
+    "EVENT_BY_NAME",
+    "EVENTS_BY_NAMES",
+    "EVENTS_BY_IDS",
+    "principal_by_email",
+    "search_events",
+]
+
+# Hot lookups, built once and executed with their parameters, e.g.
+#
+#     await session.execute(USER_BY_EMAIL, {"email": email})
+#
+# Building a select() per request costs more Python time than executing this one: its cache key
+# is computed once and the compiled SQL is found in the compiled cache of the engine.
+USER_BY_EMAIL: Select = select(UserORM).where(UserORM.email == bindparam("email"))
+ADMIN_BY_EMAIL: Select = select(AdminORM).where(AdminORM.email == bindparam("email"))
+EVENT_BY_NAME: Select = select(EventORM).where(EventORM.name == bindparam("name"))
+# Batch lookups, the list parameter is expanded into IN (...) at execution
+EVENTS_BY_NAMES: Select = select(EventORM).where(
+    EventORM.name.in_(bindparam("names", expanding=True))
+)
+EVENTS_BY_IDS: Select = select(EventORM).where(EventORM.id_.in_(bindparam("ids", expanding=True)))
+
+
+def principal_by_email(email: str) -> CompoundSelect:
+    """
+    Resolve an email to a user or an admin in a single round trip.
+
+    Both branches are lookups on the unique email index. The `role` column tells which table a
+    row comes from, the admin branch pads the columns that only users have with NULLs (and a zero
+    token version), so that a user row carries every column of UserORM.
+
+    Parameters:
+        email (str): The email to resolve.
+
+    Returns:
+        CompoundSelect: UNION ALL of at most one user row and one admin row.
+    """
+    users = select(
+        literal(Role.USER.value, String).label("role"),
+        UserORM.id_.label("id_"),
+        UserORM.first_name,
+        UserORM.last_name,
+        UserORM.email,
+        UserORM.password,
+        UserORM.date_of_birth,
+        UserORM.gender,
+        UserORM.phone,
+        UserORM.token_version,
+        UserORM.created_at,
+        UserORM.updated_at,
+    ).where(UserORM.email == email)
+    admins = select(
+        literal(Role.ADMIN.value, String),
+        AdminORM.id_,
+        AdminORM.first_name,
+        AdminORM.last_name,
+        AdminORM.email,
+        AdminORM.password,
+        null(),
+        null(),
+        null(),
+        # Admins have no token version, 0 keeps the claim of their stateless tokens an integer
+        literal(0, Integer),
+        null(),
+        null(),
+    ).where(AdminORM.email == email)
+    return union_all(users, admins)
+
+
+def search_events(
+    status: EventStatus = EventStatus.ACTIVE,
+    destination: Optional[str] = None,
+    start_location: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    min_available_seats: int = 0,
+    limit: int = 50,
+) -> Select:
+    """
+    Search events, ordered by start date.
+
+    The predicates line up with the search indexes of the events table: `status` and the location
+    are equalities, the dates bound a range of `event_start_date` and the minimum free seats is
+    checked on `available_seats`, the last column of each index. Events of a date range start on
+    or after `date_from` and end on or before `date_to`, the start date is bounded by `date_to`
+    too, so that the range scan stops there. Ties on the start date are ordered by id, so that
+    the results are stable.
+
+    Parameters:
+        status (EventStatus): Status of the events, active by default.
+        destination (str | None): Exact destination.
+        start_location (str | None): Exact start location.
+        date_from (date | None): Earliest start date.
+        date_to (date | None): Latest end date.
+        min_available_seats (int): Minimum number of free seats.
+        limit (int): Maximum number of events.
+
+    Returns:
+        Select: The events matching every given criterion.
+    """
+    stmt = select(EventORM).where(EventORM.status == status)
+    if destination is not None:
+        stmt = stmt.where(EventORM.destination == destination)
+    if start_location is not None:
+        stmt = stmt.where(EventORM.start_location == start_location)
+    if date_from is not None:
+        stmt = stmt.where(EventORM.event_start_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(EventORM.event_start_date <= date_to, EventORM.event_end_date <= date_to)
+    if min_available_seats > 0:
+        stmt = stmt.where(EventORM.available_seats >= min_available_seats)
+    return stmt.order_by(EventORM.event_start_date, EventORM.id_).limit(limit)
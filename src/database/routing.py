@@ -0,0 +1,124 @@
+# src/database/routing.py
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from configs import DBConfig
+from database.engine import SessionLocal, engine, replica_engines
+
+__all__ = ["ReplicaRouter", "replica_router", "read_session", "reading"]
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = DBConfig.replicas.get(
+    "health_check_interval_seconds", default=5, cast=float
+)
+HEALTH_CHECK_TIMEOUT = DBConfig.replicas.get("health_check_timeout_seconds", default=1, cast=float)
+
+
+class ReplicaRouter:
+    """
+    Description
+
+    Spreads read-only sessions over the healthy read replicas, round robin, and falls back to the
+    primary when there is no healthy replica. Replicas are assumed healthy until a health check or
+    a failed query says otherwise, a replica marked unhealthy is back in rotation after it passes
+    a health check.
+
+    Attributes
+
+    primary (AsyncEngine):
+        The engine of the primary, used when no replica is healthy.
+
+    replicas (list[AsyncEngine]):
+        The engines of the read replicas, possibly empty.
+
+    healthy (set[AsyncEngine]):
+        The replicas currently in rotation.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        timeout: float = HEALTH_CHECK_TIMEOUT,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.timeout = timeout
+        self.healthy = set(replicas)
+        self._rotation = itertools.cycle(replicas) if replicas else None
+
+    def pick(self) -> AsyncEngine:
+        """The next healthy replica, the primary if there is none."""
+        for _ in range(len(self.replicas)):
+            replica = next(self._rotation)
+            if replica in self.healthy:
+                return replica
+        return self.primary
+
+    def mark_unhealthy(self, replica: AsyncEngine) -> None:
+        if replica in self.healthy:
+            logger.warning("Read replica %s is unhealthy", replica.url.host)
+            self.healthy.discard(replica)
+
+    async def ping(self, replica: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with replica.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception:
+            return False
+        return True
+
+    async def check(self) -> None:
+        """Ping every replica concurrently and update the rotation."""
+        results = await asyncio.gather(*(self.ping(replica) for replica in self.replicas))
+        for replica, ok in zip(self.replicas, results):
+            if not ok:
+                self.mark_unhealthy(replica)
+            elif replica not in self.healthy:
+                logger.info("Read replica %s is healthy again", replica.url.host)
+                self.healthy.add(replica)
+
+    async def monitor(self, interval: float = HEALTH_CHECK_INTERVAL) -> None:
+        """Background task that runs a health check every `interval` seconds until cancelled."""
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+
+replica_router = ReplicaRouter(engine, replica_engines)
+
+
+def read_session(primary: bool = False, router: Optional[ReplicaRouter] = None) -> AsyncSession:
+    """
+    Open a session for read-only work, bound to a replica picked by `router` (the global one by
+    default), or to the primary if `primary` is set, e.g. for read-your-writes.
+    """
+    router = router or replica_router
+    bind = router.primary if primary else router.pick()
+    return SessionLocal(bind=bind)
+
+
+@asynccontextmanager
+async def reading(
+    primary: bool = False, router: Optional[ReplicaRouter] = None
+) -> AsyncIterator[AsyncSession]:
+    """
+    `read_session` as a context manager, that takes the replica out of rotation when its
+    connection fails.
+    """
+    router = router or replica_router
+    async with read_session(primary, router) as session:
+        try:
+            yield session
+        except (OperationalError, InterfaceError):
+            router.mark_unhealthy(session.bind)
+            raise
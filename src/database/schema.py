@@ -10,9 +10,11 @@ from typing import Optional
 from sqlalchemy import (
     DDL,
     TIMESTAMP,
+    Computed,
     Date,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -50,6 +52,8 @@ class AdminORM(Base):
 
 class UserORM(TimestampBase):
     __tablename__ = users_name
+    # Sort key of the keyset paginated listings
+    __table_args__ = (Index(f"ix_{users_name}_created_at_id", "created_at", "id"),)
 
     id_: Mapped[int] = mapped_column("id", Integer, autoincrement=True, primary_key=True)
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -59,6 +63,10 @@ class UserORM(TimestampBase):
     gender: Mapped[Optional[Gender]] = mapped_column(Enum(Gender), nullable=True)
     email: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
     phone: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Bumped on email/password changes, tokens carrying an older version are revoked
+    token_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
 
     # Aliased relationship attributes
     user_bookings: Mapped[list["BookingORM"]] = relationship(
@@ -78,6 +86,28 @@ class UserORM(TimestampBase):
 
 class EventORM(TimestampBase):
     __tablename__ = DBConfig.tables.events
+    # Search indexes: equality columns first, then the start date range, with available_seats
+    # last so that the minimum free seats predicate is checked on the index entries
+    __table_args__ = (
+        Index(f"ix_{events_name}_created_at_id", "created_at", "id"),
+        Index(
+            f"ix_{events_name}_search_destination",
+            "status",
+            "destination",
+            "event_start_date",
+            "available_seats",
+        ),
+        Index(
+            f"ix_{events_name}_search_start_location",
+            "status",
+            "start_location",
+            "event_start_date",
+            "available_seats",
+        ),
+        Index(
+            f"ix_{events_name}_search_start_date", "status", "event_start_date", "available_seats"
+        ),
+    )
 
     id_: Mapped[int] = mapped_column("id", Integer, autoincrement=True, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
@@ -110,6 +140,10 @@ class EventORM(TimestampBase):
     reserved_seats: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     total_seats: Mapped[int] = mapped_column(Integer, nullable=False)
     price_per_seat: Mapped[Decimal] = mapped_column(Numeric(7, 2, asdecimal=True), nullable=False)
+    # Maintained by MySQL on every write of the seat columns, so that it can be indexed
+    available_seats: Mapped[int] = mapped_column(
+        Integer, Computed("total_seats - reserved_seats", persisted=True)
+    )
 
     # Relationships
     bookings: Mapped[list["BookingORM"]] = relationship(
@@ -119,6 +153,12 @@ class EventORM(TimestampBase):
 
 class BookingORM(TimestampBase):
     __tablename__ = bookings_name
+    __table_args__ = (
+        Index(f"ix_{bookings_name}_status_expires_at", "status", "expires_at"),
+        Index(f"ix_{bookings_name}_created_at_id", "created_at", "id"),
+        Index(f"ix_{bookings_name}_event_id_status", "event_id", "status"),
+        Index(f"ix_{bookings_name}_user_id", "user_id"),
+    )
 
     id_: Mapped[int] = mapped_column("id", Integer, autoincrement=True, primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -145,6 +185,8 @@ class BookingORM(TimestampBase):
     refund_amount: Mapped[Decimal] = mapped_column(
         Numeric(7, 2, asdecimal=True), nullable=False, default=Decimal("0.00")
     )
+    # Seat holds (pending bookings) are released by the sweeper once expired
+    expires_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
 
     # Relationships
     user: Mapped["UserORM"] = relationship(back_populates="user_bookings", lazy="select")
@@ -184,6 +226,7 @@ class PaymentORM(TimestampBase):
 
 class CancellationORM(TimestampBase):
     __tablename__ = DBConfig.tables.cancellations
+    __table_args__ = (Index(f"ix_{cancellations_name}_user_id", "user_id"),)
 
     id_: Mapped[int] = mapped_column("id", Integer, autoincrement=True, primary_key=True)
     user_id: Mapped[int] = mapped_column(
@@ -207,48 +250,6 @@ class CancellationORM(TimestampBase):
     booking: Mapped["BookingORM"] = relationship(back_populates="cancellation", lazy="select")
 
 
-check_seats_before_insert = DDL(
-    f"""
-CREATE TRIGGER bookings_check_seats_before_insert
-BEFORE INSERT ON {DBConfig.tables.bookings}
-FOR EACH ROW
-BEGIN
-    DECLARE available_seats INT;
-
-    SELECT (total_seats  - reserved_seats)
-    INTO available_seats
-    FROM {DBConfig.tables.events}
-    WHERE id = NEW.event_id;
-    
-    IF NEW.seats > available_seats THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Not enough available seats for this event.';
-    END IF;
-END ;
-"""
-)
-
-
-increment_reserved_seats_after_insert = DDL(
-    f"""
-    CREATE TRIGGER bookings_increment_reserved_seats_after_insert
-    AFTER INSERT ON {DBConfig.tables.bookings}
-    FOR EACH ROW
-    BEGIN
-        DECLARE current_reserved_seats INT;
-
-        SELECT reserved_seats
-        INTO current_reserved_seats
-        FROM {DBConfig.tables.events}
-        WHERE id = NEW.event_id;
-
-        UPDATE {DBConfig.tables.events}
-        SET reserved_seats = current_reserved_seats + NEW.seats
-        WHERE id = NEW.event_id;
-    END;
-    """
-)
-
 decrement_reserved_seats_after_insert = DDL(
     f"""
     CREATE TRIGGER cancellations_decrease_reserved_seats_after_insert
@@ -278,8 +279,7 @@ decrement_reserved_seats_after_insert = DDL(
 
 
 def register_triggers():
-    event.listen(BookingORM.sa_table(), "after_create", check_seats_before_insert)
-    event.listen(BookingORM.sa_table(), "after_create", increment_reserved_seats_after_insert)
+    # Seat reservations for bookings are done by the conditional UPDATE in database.bookings
     event.listen(CancellationORM.sa_table(), "after_create", decrement_reserved_seats_after_insert)
 
 
@@ -318,13 +318,13 @@ async def reset_tables(eng: AsyncEngine, tables_to_reset: Optional[list[str]] =
     print(f"Resetting tables: {', '.join(t.name for t in tables)}")
 
     try:
-        async with engine.begin() as conn:
+        async with eng.begin() as conn:
             # Drop all tables
             await conn.run_sync(metadata.drop_all, tables=tables, checkfirst=True)
             # Create tables
             await conn.run_sync(metadata.create_all, tables=tables, checkfirst=True)
     finally:
-        await engine.dispose()
+        await eng.dispose()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,8 @@ __all__ = [
     "get_all_tables",
     "reset_database",
     "reset_table",
+    "is_duplicate_key",
+    "is_missing_reference",
 ]
 
 
@@ -156,7 +158,7 @@ def create_index_if_not_exists(
         columns = [columns]
 
     table_obj = table.__table__ if hasattr(table, "__table__") else table
-    cols_objects = [getattr(table.c, col) for col in columns]
+    cols_objects = [getattr(table_obj.c, col) for col in columns]
     if not index_name:
         index_name = f"ix_{table_obj.name}_{'_'.join(columns)}"
     index = sa.Index(index_name, *cols_objects, unique=unique)
@@ -165,3 +167,29 @@ def create_index_if_not_exists(
         index.create(bind=engine)
     except sa.exc.DatabaseError:
         pass
+
+
+MYSQL_DUPLICATE_ENTRY = 1062
+MYSQL_NO_REFERENCED_ROW = 1452
+
+
+def is_duplicate_key(error: sa.exc.IntegrityError) -> bool:
+    """
+    Whether an IntegrityError was raised by a duplicate value of a unique key.
+
+    Parameters:
+        error: The IntegrityError raised by the failed statement.
+    """
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == MYSQL_DUPLICATE_ENTRY
+
+
+def is_missing_reference(error: sa.exc.IntegrityError) -> bool:
+    """
+    Whether an IntegrityError was raised by a foreign key referencing a row that does not exist.
+
+    Parameters:
+        error: The IntegrityError raised by the failed statement.
+    """
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == MYSQL_NO_REFERENCED_ROW
@@ -23,3 +23,13 @@ class PaymentMethod(Enum):
     CASH = "cash"
     CARD = "card"
     TRANSFER = "transfer"
+
+
+class Role(Enum):
+    USER = "user"
+    ADMIN = "admin"
+
+
+class ExportFormat(Enum):
+    NDJSON = "ndjson"  # One JSON object per line
+    CSV = "csv"
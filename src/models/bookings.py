@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class BookingHold(BaseModel):
+    event_name: str = Field(..., min_length=1, max_length=100)
+    seats: int = Field(..., gt=0)
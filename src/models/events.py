@@ -0,0 +1,37 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.enumerations import EventStatus
+
+MAX_BATCH_SIZE = 200
+
+
+class EventSearch(BaseModel):
+    destination: Optional[str] = Field(None, min_length=1, max_length=50)
+    start_location: Optional[str] = Field(None, min_length=1, max_length=50)
+    date_from: Optional[date] = Field(None, description="Events starting on or after this date")
+    date_to: Optional[date] = Field(None, description="Events ending on or before this date")
+    status: EventStatus = EventStatus.ACTIVE
+    min_available_seats: int = Field(0, ge=0)
+    limit: int = Field(50, ge=1, le=500)
+
+    @model_validator(mode="after")
+    def check_date_range(self) -> "EventSearch":
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        return self
+
+
+class EventBatch(BaseModel):
+    """The events to look up in one request, by name or by id."""
+
+    names: Optional[list[str]] = Field(None, min_length=1, max_length=MAX_BATCH_SIZE)
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=MAX_BATCH_SIZE)
+
+    @model_validator(mode="after")
+    def check_one_key(self) -> "EventBatch":
+        if (self.names is None) == (self.ids is None):
+            raise ValueError("Exactly one of names and ids must be given")
+        return self
@@ -1,16 +1,19 @@
 # src/models/responses.py
 from decimal import Decimal
-from typing import Optional
+from typing import Generic, Optional, TypeVar, Union
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, computed_field
 
 from models.custom_types import AthensDateTime, CustomDate
 from models.schema import AdminModel
+from src.enumerations import BookingStatus
 
 default_configs = ConfigDict(
     from_attributes=True, serialize_by_alias=True, str_strip_whitespace=True
 )
 
+T = TypeVar("T")
+
 
 class EventResponse(BaseModel):
     id_: Optional[int] = Field(None, exclude=True)
@@ -32,6 +35,20 @@ class EventResponse(BaseModel):
 
     model_config = default_configs
 
+    # Derived here rather than read from the generated column, which is not loaded after inserts
+    @computed_field
+    @property
+    def available_seats(self) -> int:
+        return self.total_seats - self.reserved_seats
+
+
+class EventLookup(BaseModel):
+    """One result of a batch event lookup, `event` is None if there is no such event."""
+
+    key: Union[int, str]
+    found: bool
+    event: Optional[EventResponse] = None
+
 
 class UserResponse(BaseModel):
     id_: Optional[int] = Field(None, exclude=True)
@@ -48,6 +65,18 @@ class UserResponse(BaseModel):
     model_config = default_configs
 
 
+class BookingResponse(BaseModel):
+    # The id is exposed as it is needed to confirm a seat hold
+    id_: int = Field(..., alias="id")
+    event_id: int
+    unit_price: Decimal
+    seats: int
+    status: BookingStatus
+    expires_at: Optional[AthensDateTime] = None
+
+    model_config = default_configs
+
+
 class TokenResponse(BaseModel):
 
     access_token: str
@@ -56,3 +85,10 @@ class TokenResponse(BaseModel):
     admin: Optional[AdminModel] = None
 
     model_config = default_configs
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of a keyset paginated listing, `next_cursor` is None on the last page."""
+
+    items: list[T]
+    next_cursor: Optional[str] = None
@@ -1 +1,9 @@
+from .cache import TTLCache
 from .config_meta import ConfigMeta
+from .singleflight import SingleFlight
+
+__all__ = [
+    "ConfigMeta",
+    "TTLCache",
+    "SingleFlight",
+]
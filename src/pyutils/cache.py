@@ -0,0 +1,118 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+__all__ = ["TTLCache"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Description
+
+    A bounded in-process cache with least-recently-used eviction and time-to-live expiry.
+    Expired entries are dropped lazily when they are looked up or when the least recently
+    used entries are evicted. The cache is meant for a single event loop and is not thread safe.
+
+    Attributes
+
+    max_size (int):
+        The maximum number of entries. Inserting beyond it evicts the least recently used entry.
+
+    ttl (float):
+        The default time-to-live of an entry in seconds.
+
+    max_weight (int | None):
+        Optional cap on the total weight of the entries (e.g. their approximate size in bytes),
+        as measured by `weigher`. Inserting beyond it evicts the least recently used entries.
+
+    hits, misses, evictions, expirations (int):
+        Counters of the lookups served, the lookups missed, the entries evicted because of the
+        size or weight limits and the entries dropped because they expired.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        max_weight: Optional[int] = None,
+        weigher: Callable[[V], int] = lambda _value: 1,
+    ):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.weight = 0
+        self._entries: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value, weight = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.weight -= weight
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:  # noqa A003
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        weight = self.weigher(value)
+        self.invalidate(key)
+        self._entries[key] = (expires_at, value, weight)
+        self.weight += weight
+        while len(self._entries) > self.max_size or (
+            self.max_weight is not None and self.weight > self.max_weight and self._entries
+        ):
+            _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+            self.weight -= evicted_weight
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.weight = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "weight": self.weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._entries.get(key, _MISSING)
+        return entry is not _MISSING and entry[0] > self.clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
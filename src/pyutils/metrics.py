@@ -0,0 +1,243 @@
+import math
+from bisect import bisect_left
+from typing import Callable, Iterable, Sequence, Union
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "CallbackMetric",
+    "Registry",
+    "CONTENT_TYPE",
+    "LATENCY_BUCKETS",
+]
+
+# The Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+Sample = tuple[Labels, float]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    Description
+
+    A monotonic counter, one value per combination of label values. The label values are passed
+    positionally, in the order of `labelnames`.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, value in self._values.items():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class HistogramSeries:
+    """The buckets of one combination of label values, counts are per bucket (not cumulative)."""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class Histogram(_Metric):
+    """
+    Description
+
+    A histogram with fixed buckets. The buckets of a combination of label values are allocated
+    once, when it is first observed (or by `series`), an observation then only costs a binary
+    search of the bucket and two increments, the counts are only made cumulative when rendered.
+
+    Attributes
+
+    buckets (tuple[float, ...]):
+        The upper bounds of the buckets, increasing, the +Inf bucket is appended.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        if list(buckets) != sorted(buckets):
+            raise ValueError("Bucket bounds must be increasing")
+        self.buckets = tuple(b for b in buckets if b != math.inf) + (math.inf,)
+        self._series: dict[Labels, HistogramSeries] = {}
+
+    def series(self, labels: Labels = ()) -> HistogramSeries:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = HistogramSeries(len(self.buckets))
+        return series
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels) or self.series(labels)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        names = self.labelnames + ("le",)
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series.counts):
+                cumulative += count
+                bucket_labels = _format_labels(names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            formatted = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{formatted} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{formatted} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """
+    Description
+
+    A gauge or a counter whose values are read by `callback` when the registry is rendered, for
+    values something else already keeps (e.g. the counters of a cache). The callback returns the
+    label values and the value of every sample.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Iterable[Sample]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        if kind not in ("gauge", "counter"):
+            raise ValueError(f"Invalid metric kind: {kind}")
+        self.kind = kind
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, value in self.callback():
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+Metric = Union[Counter, Histogram, CallbackMetric]
+
+
+class Registry:
+    """
+    Description
+
+    The metrics of a process, rendered in the Prometheus text format.
+
+    The metrics are updated without locks: they are meant for a single event loop, where an
+    update never interleaves with another one or with the rendering. Several worker processes
+    each have their own registry, scraped separately.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Iterable[Sample]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        metric = CallbackMetric(name, documentation, callback, labelnames, kind)
+        return self.register(metric)  # type: ignore
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._metrics
@@ -0,0 +1,152 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__all__ = [
+    "QueryLog",
+    "QueryBudgetExceeded",
+    "current_query_log",
+    "count_statements",
+    "count_queries",
+    "query_budget",
+    "fingerprint",
+    "REPEAT_LIMIT",
+]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Executions of the same statement shape beyond which a unit of work is reported as N+1
+REPEAT_LIMIT = 3
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\?|(?<![:\w]):\w+")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """
+    The shape of a statement: its literals and placeholders replaced by `?`, lists of values
+    (e.g. an expanded IN) collapsed to `(?+)` and whitespace normalized, so that executions
+    that only differ by their values share it.
+    """
+    shape = _LITERALS.sub("?", statement)
+    shape = _PLACEHOLDERS.sub("?", shape)
+    shape = _LISTS.sub("(?+)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A unit of work ran more statements than its budget, or the same statement too often."""
+
+
+class QueryLog:
+    """
+    Description
+
+    The statements run by one unit of work (e.g. a request or a test), counted by fingerprint.
+    The work in progress exposes its log through `current_query_log`, so that the cursor hooks
+    of `count_statements` record into it. A unit of work nested in another (e.g. a request
+    made by a test) records into the log of the outer one as well.
+
+    Attributes
+
+    counts (dict[str, int]):
+        Executions of every statement fingerprint, in the order they first ran.
+
+    parent (QueryLog | None):
+        The log of the enclosing unit of work, if any.
+    """
+
+    __slots__ = ("counts", "parent")
+
+    def __init__(self, parent: Optional["QueryLog"] = None):
+        self.counts: dict[str, int] = {}
+        self.parent = parent
+
+    def record(self, statement: str) -> None:
+        shape = fingerprint(statement)
+        log: Optional[QueryLog] = self
+        while log is not None:
+            log.counts[shape] = log.counts.get(shape, 0) + 1
+            log = log.parent
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def repeated(self, repeat_limit: int = REPEAT_LIMIT) -> dict[str, int]:
+        """The fingerprints that ran more than `repeat_limit` times, the signature of an N+1."""
+        return {shape: count for shape, count in self.counts.items() if count > repeat_limit}
+
+    def violations(
+        self, budget: Optional[int] = None, repeat_limit: Optional[int] = REPEAT_LIMIT
+    ) -> list[str]:
+        """What went over `budget` statements in total or over `repeat_limit` per fingerprint."""
+        problems = []
+        if budget is not None and self.total > budget:
+            problems.append(f"{self.total} statements for a budget of {budget}")
+        if repeat_limit is not None:
+            for shape, count in self.repeated(repeat_limit).items():
+                problems.append(f"{count} executions of the same statement (N+1?): {shape}")
+        return problems
+
+
+# The statements of the work in progress, None when they are not counted
+current_query_log: ContextVar[Optional[QueryLog]] = ContextVar("current_query_log", default=None)
+
+
+def count_statements(target: Any = Engine) -> None:
+    """
+    Record every statement run by `target` (every engine by default) in the current query log.
+
+    Only the statements SQLAlchemy compiled are counted, the ones sent as is by the dialect
+    (e.g. the variables it reads on the first connection of an engine) are not part of the work.
+    Overlapping registrations (e.g. on every engine and on one of them) record a statement once.
+    """
+
+    @event.listens_for(target, "before_cursor_execute")
+    def record_statement(_conn, _cursor, statement, _parameters, context, _executemany):
+        log = current_query_log.get()
+        if log is None or context.compiled is None or "query_counted" in vars(context):
+            return
+        context.query_counted = True
+        log.record(statement)
+
+
+@contextmanager
+def count_queries(
+    budget: Optional[int] = None, repeat_limit: Optional[int] = REPEAT_LIMIT
+) -> Iterator[QueryLog]:
+    """
+    Count the statements run in the block (by engines registered with `count_statements`).
+
+    Raises:
+        QueryBudgetExceeded: If the block ran more than `budget` statements, or a statement more
+            than `repeat_limit` times.
+    """
+    log = QueryLog(parent=current_query_log.get())
+    token = current_query_log.set(log)
+    try:
+        yield log
+    finally:
+        current_query_log.reset(token)
+    problems = log.violations(budget, repeat_limit)
+    if problems:
+        raise QueryBudgetExceeded("; ".join(problems))
+
+
+def query_budget(statements: int) -> Callable[[F], F]:
+    """Declare the most statements an endpoint may run per request."""
+
+    def declare(endpoint: F) -> F:
+        endpoint.query_budget = statements  # type: ignore[attr-defined]
+        return endpoint
+
+    return declare
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+__all__ = ["SingleFlight"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Description
+
+    Collapses concurrent calls with the same key into a single call. The first caller of a key
+    starts the call, the callers that arrive while it is in flight wait for it and all of them
+    get its result (or its exception). Once the call is over the key is free again, results are
+    not cached.
+
+    The call runs in its own task, so that a cancelled caller does not cancel it for the others.
+    It should therefore not use resources owned by a single caller, such as its database
+    session, and the result is shared as is, so it should not be mutated by the callers.
+
+    Attributes
+
+    calls (int):
+        The calls started.
+
+    coalesced (int):
+        The callers that shared the result of a call started by another caller.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[K, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._forget(key, future))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _forget(self, key: K, future: asyncio.Future) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
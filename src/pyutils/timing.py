@@ -0,0 +1,93 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__all__ = ["Timings", "current_timings", "timed", "time_statements"]
+
+
+class Timings:
+    """
+    Description
+
+    Time spent in the phases of one unit of work (e.g. a request), by phase name, with the
+    number of times each phase ran. The work in progress exposes its timings through
+    `current_timings`, so that code deep in the call stack records into them without having
+    them passed along.
+
+    Attributes
+
+    durations (dict[str, float]):
+        Seconds spent in every phase.
+
+    counts (dict[str, int]):
+        Times every phase ran.
+    """
+
+    __slots__ = ("durations", "counts")
+
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def server_timing(self) -> str:
+        """The phases in the `Server-Timing` header format, durations in milliseconds."""
+        return ", ".join(
+            f'{name};dur={seconds * 1000:.2f};desc="{self.counts[name]}x"'
+            for name, seconds in self.durations.items()
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """The durations in milliseconds and the counts, e.g. for a structured log line."""
+        values: dict[str, Any] = {}
+        for name, seconds in self.durations.items():
+            values[f"{name}_ms"] = round(seconds * 1000, 2)
+            values[f"{name}_count"] = self.counts[name]
+        return values
+
+
+# The timings of the work in progress, None when it is not timed (e.g. not sampled)
+current_timings: ContextVar[Optional[Timings]] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Record the duration of the block as phase `name` of the current timings, if any."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def time_statements(target: Any = Engine, name: str = "db") -> None:
+    """
+    Record the execution of every statement run by `target` (every engine by default) as
+    phase `name` of the current timings. The duration is the one of the cursor execution: the
+    round trip to the server and the query time, without the ORM work on the results.
+
+    Overlapping registrations (e.g. on every engine and on one of them) record a statement once.
+    """
+
+    @event.listens_for(target, "before_cursor_execute")
+    def start_timer(_conn, _cursor, _statement, _parameters, context, _executemany):
+        if current_timings.get() is not None and "timing_start" not in vars(context):
+            context.timing_start = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def stop_timer(_conn, _cursor, _statement, _parameters, context, _executemany):
+        start = vars(context).pop("timing_start", None)
+        timings = current_timings.get()
+        if timings is not None and start is not None:
+            timings.add(name, time.perf_counter() - start)
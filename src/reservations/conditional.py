@@ -0,0 +1,28 @@
+# src/reservations/conditional.py
+import hashlib
+from typing import Any
+
+from fastapi import Request
+
+__all__ = ["make_etag", "if_none_match"]
+
+
+def make_etag(*parts: Any) -> str:
+    """A strong entity tag (quoted, as sent in the ETag header) derived from `parts`."""
+    raw = ":".join(str(part) for part in parts).encode()
+    return f'"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    Whether the If-None-Match header of the request matches `etag`, i.e. the client already
+    holds the current representation and a 304 Not Modified can be returned. Matching is weak,
+    as RFC 9110 requires for If-None-Match, so W/"..." tags match too.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in header.split(","))
+    return etag in (tag.removeprefix("W/") for tag in tags)
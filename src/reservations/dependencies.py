@@ -1,65 +1,327 @@
 # src/reservations/dependencies.py
-from typing import AsyncGenerator, Optional
+import math
+import time
+from typing import Any, AsyncGenerator, Optional, Type, TypeVar
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import Row, event, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from configs import DBConfig
+from database.base import Base
 from database.engine import SessionLocal
+from database.queries import ADMIN_BY_EMAIL, USER_BY_EMAIL, principal_by_email
+from database.routing import reading, replica_router
 from database.schema import AdminORM, UserORM
+from pyutils import SingleFlight, TTLCache
+from reservations.principals import Principal, principal_from_claims, token_versions
 from reservations.security import decode_access_token
+from src.enumerations import Role
 
+T = TypeVar("T", bound=Base)
 
-async def open_async_session() -> AsyncGenerator[AsyncSession, None]:
+
+# ======= Sessions =====
+# After a commit the client reads from the primary for a while (see `open_read_session`). The
+# deadline travels in a cookie, so it holds whichever worker serves the next request.
+READ_PRIMARY_COOKIE = "read_primary_until"
+STICKINESS_SECONDS = DBConfig.replicas.get("stickiness_seconds", default=5, cast=float)
+
+
+def stick_to_primary(response: Response) -> None:
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        f"{time.time() + STICKINESS_SECONDS:.3f}",
+        max_age=math.ceil(STICKINESS_SECONDS),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def reads_from_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def open_async_session(response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the primary, for endpoints that write."""
     async with SessionLocal() as session:
+        if replica_router.replicas:
+            event.listen(session.sync_session, "after_commit", lambda _: stick_to_primary(response))
+        yield session
+
+
+async def open_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints, on a healthy read replica, or on the primary when there is
+    none or when the client committed a write within the last `STICKINESS_SECONDS`, so that it
+    reads its own writes despite the replication lag. A replica that loses its connection is
+    taken out of rotation until it passes a health check.
+    """
+    async with reading(primary=reads_from_primary(request)) as session:
         yield session
 
 
 # ======= Authentication =====
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+# Column values of authenticated principals keyed by (role, token subject). Entries are dropped
+# by the endpoints that change or delete a principal, the TTL bounds the staleness across workers.
+principal_cache: TTLCache[tuple[str, str], dict] = TTLCache(
+    max_size=DBConfig.cache.get("principal_max_size", default=10_000, cast=int),
+    ttl=DBConfig.cache.get("principal_ttl_seconds", default=60, cast=float),
+)
+
+
+# Concurrent lookups of the same uncached principal share one query. The lookups run in their
+# own session (see `SingleFlight`), the callers attach the shared column values to theirs.
+principal_lookups: SingleFlight[tuple, Any] = SingleFlight()
+
+
+def invalidate_principal(role: str, email: str) -> None:
+    principal_cache.invalidate((role, email))
+
+
+def snapshot_principal(orm: Base) -> dict:
+    return {attr.key: getattr(orm, attr.key) for attr in inspect(type(orm)).column_attrs}
+
+
+async def restore_principal(session: AsyncSession, orm_class: Type[T], snapshot: dict) -> T:
+    """
+    Attach a cached principal to the session without a query. The instance is built from the
+    cached column values and merged as if it had been loaded, so endpoints can still modify it.
+    """
+    orm = orm_class(**snapshot)
+    make_transient_to_detached(orm)
+    return await session.merge(orm, load=False)
+
+
+def decode_token_payload(token: str) -> dict:
+    """
+    Decode and validate an access token.
+
+    Raises:
+        HTTPException (401):
+            - If the token is invalid or expired.
+            - If the `sub` claim is missing from the payload.
+    """
+    try:
+        payload = decode_access_token(token)
+    except jwt.PyJWTError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Token error: {str(ex)}"
+        )
+
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: missing subject"
+        )
+    return payload
+
+
+def claimed_principal(payload: dict) -> Optional[Principal]:
+    """
+    The principal carried by the claims of a stateless token, if any.
+
+    Raises:
+        HTTPException (401):
+            - If the claims are malformed.
+            - If the token version has been revoked.
+    """
+    try:
+        principal = principal_from_claims(payload)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: malformed claims"
+        )
+
+    if principal is not None and token_versions.is_revoked(principal):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return principal
+
+
+async def fetch_user(email: str) -> Optional[dict]:
+    # From the primary, the row is loaded for endpoints that modify it
+    async with reading(primary=True) as session:
+        result = await session.execute(USER_BY_EMAIL, {"email": email})
+        user: Optional[UserORM] = result.scalars().first()
+        if user is None:
+            return None
+        snapshot = snapshot_principal(user)
+    principal_cache.set(("user", email), snapshot)
+    token_versions.observe(Role.USER, user.id_, user.token_version)
+    return snapshot
+
+
+async def fetch_admin(email: str) -> Optional[dict]:
+    async with reading(primary=True) as session:
+        result = await session.execute(ADMIN_BY_EMAIL, {"email": email})
+        admin: Optional[AdminORM] = result.scalar_one_or_none()
+        if admin is None:
+            return None
+        snapshot = snapshot_principal(admin)
+    principal_cache.set(("admin", email), snapshot)
+    return snapshot
+
+
+async def load_user(session: AsyncSession, email: str) -> Optional[UserORM]:
+    snapshot = principal_cache.get(("user", email))
+    if snapshot is None:
+        snapshot = await principal_lookups.do(("user", email), lambda: fetch_user(email))
+    if snapshot is None:
+        return None
+    return await restore_principal(session, UserORM, snapshot)
+
+
+async def load_admin(session: AsyncSession, email: str) -> Optional[AdminORM]:
+    snapshot = principal_cache.get(("admin", email))
+    if snapshot is None:
+        snapshot = await principal_lookups.do(("admin", email), lambda: fetch_admin(email))
+    if snapshot is None:
+        return None
+    return await restore_principal(session, AdminORM, snapshot)
+
+
+async def lookup_principal(session: AsyncSession, email: str) -> Optional[Row]:
+    """
+    Resolve an email to a user or an admin with one query (see `database.queries`), so that
+    admin logins and failed logins cost a single round trip.
+
+    Returns:
+        Row | None: The principal row with its `role` discriminator, None if the email is unknown.
+    """
+    result = await session.execute(principal_by_email(email))
+    # An email registered both as a user and as an admin resolves to the user
+    return min(result.all(), key=lambda row: row.role != Role.USER.value, default=None)
+
+
+def cache_principal(row: Row) -> None:
+    """Keep a principal row resolved by `lookup_principal` in the principal cache."""
+    role = Role(row.role)
+    orm_class = UserORM if role is Role.USER else AdminORM
+    mapping = row._mapping
+    principal_cache.set(
+        (role.value, row.email),
+        {attr.key: mapping[attr.key] for attr in inspect(orm_class).column_attrs},
+    )
+    token_versions.observe(role, row.id_, row.token_version or 0)
+
+
+async def resolve_principal(email: str, primary: bool) -> Optional[Row]:
+    async with reading(primary=primary) as session:
+        row = await lookup_principal(session, email)
+    if row is not None:
+        cache_principal(row)
+    return row
+
+
+async def get_current_principal(request: Request, token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Dependency that extracts the current caller (user or admin) from a JWT access token,
+    for endpoints that only need the id, email or role and not the database row.
+
+    Steps:
+        1. Reads the JWT token from the `Authorization: Bearer <token>` header.
+        2. With a stateless token, builds the principal from its `uid`, `role` and `ver` claims
+           without any query.
+        3. Otherwise resolves the `sub` claim (the email) to a user or an admin, from the
+           principal cache or with a single query, shared by the concurrent requests of the
+           same principal.
+
+    Raises:
+        HTTPException (401):
+            - If the token is missing, invalid, expired or revoked.
+            - If no user or admin exists with the decoded email.
+
+    Returns:
+        Principal: The authenticated caller.
+    """
+    payload = decode_token_payload(token)
+    principal = claimed_principal(payload)
+    if principal is not None:
+        return principal
+
+    email = payload["sub"]
+    for role in (Role.USER, Role.ADMIN):
+        cached = principal_cache.get((role.value, email))
+        if cached is not None:
+            return Principal(
+                id_=cached["id_"],
+                email=email,
+                role=role,
+                token_version=cached.get("token_version", 0),
+            )
+
+    primary = reads_from_primary(request)
+    row = await principal_lookups.do(
+        ("principal", email, primary), lambda: resolve_principal(email, primary)
+    )
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"No principal found with email: {email}",
+        )
+
+    return Principal(
+        id_=row.id_, email=row.email, role=Role(row.role), token_version=row.token_version or 0
+    )
+
+
+async def require_user(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if principal.role is not Role.USER:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Users only")
+    return principal
+
+
+async def require_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if principal.role is not Role.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    return principal
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(open_async_session)
 ) -> UserORM:
     """
-    Dependency that extracts and validates the current user from a JWT access token.
+    Dependency that extracts and validates the current user from a JWT access token, for
+    endpoints that need the full user row.
 
     Steps:
         1. Reads the JWT token from the `Authorization: Bearer <token>` header.
         2. Decodes the token and extracts the `sub` claim (expected to be the user's email).
-        3. Queries the database for a user with the given email.
+        3. Looks the user up in the principal cache, or queries the database for a user with
+           the given email and caches it.
         4. Returns the user object if found.
 
     Raises:
         HTTPException (401):
-            - If the token is missing, invalid, or expired.
+            - If the token is missing, invalid, expired or revoked.
             - If the `sub` claim is missing from the payload.
             - If no user exists with the decoded email.
 
     Returns:
         UserORM: The authenticated user record from the database.
     """
-    try:
-        payload = decode_access_token(token)
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: missing subject"
-            )
-    except jwt.PyJWTError as ex:
+    payload = decode_token_payload(token)
+    claimed = claimed_principal(payload)
+    if claimed is not None and claimed.role is not Role.USER:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Token error: {str(ex)}"
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: not a user"
         )
 
-    result = await session.execute(select(UserORM).filter_by(email=email))
-    user: Optional[UserORM] = result.scalars().first()
+    email = payload["sub"]
+    user = await load_user(session, email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail=f"No user found with email: {email}"
         )
+    if claimed is not None and claimed.token_version < user.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
 
     return user
 
@@ -68,37 +330,34 @@ async def get_current_admin(
     token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(open_async_session)
 ) -> AdminORM:
     """
-    Dependency that extracts and validates the current admin from a JWT access token.
+    Dependency that extracts and validates the current admin from a JWT access token, for
+    endpoints that need the full admin row.
 
     Steps:
         1. Reads the JWT token from the `Authorization: Bearer <token>` header.
-        2. Decodes the token and extracts the `sub` claim (expected to be the user's email).
-        3. Queries the database for a user with the given email.
-        4. Returns the user object if found.
+        2. Decodes the token and extracts the `sub` claim (expected to be the admin's email).
+        3. Looks the admin up in the principal cache, or queries the database for an admin
+           with the given email and caches it.
+        4. Returns the admin object if found.
 
     Raises:
         HTTPException (401):
             - If the token is missing, invalid, or expired.
             - If the `sub` claim is missing from the payload.
-            - If no user exists with the decoded email.
+            - If no admin exists with the decoded email.
 
     Returns:
-        UserORM: The authenticated user record from the database.
+        AdminORM: The authenticated admin record from the database.
     """
-    try:
-        payload = decode_access_token(token)
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: missing subject"
-            )
-    except jwt.PyJWTError as ex:
+    payload = decode_token_payload(token)
+    claimed = claimed_principal(payload)
+    if claimed is not None and claimed.role is not Role.ADMIN:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Token error: {str(ex)}"
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token: not an admin"
         )
 
-    result = await session.execute(select(AdminORM).filter_by(email=email))
-    admin: Optional[AdminORM] = result.scalar_one_or_none()
+    email = payload["sub"]
+    admin = await load_admin(session, email)
     if admin is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail=f"No admin found with email: {email}"
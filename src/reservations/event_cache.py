@@ -0,0 +1,133 @@
+# src/reservations/event_cache.py
+from collections import OrderedDict
+from typing import Any, Optional
+
+from sqlalchemy import bindparam, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import DBConfig
+from database.queries import EVENT_BY_NAME
+from database.schema import EventORM
+from pyutils import TTLCache
+
+__all__ = ["EventCache", "event_cache", "SEAT_COLUMNS"]
+
+# The columns bookings change, every other column only changes through the admin endpoints
+SEAT_COLUMNS = ("reserved_seats", "available_seats", "updated_at")
+
+EVENT_SEATS_BY_ID = select(
+    EventORM.reserved_seats, EventORM.available_seats, EventORM.updated_at
+).where(EventORM.id_ == bindparam("id_"))
+
+
+class EventCache:
+    """
+    Description
+
+    In-process cache of the events read by name. The metadata of an event (everything but the
+    seat counters) is kept for `ttl` seconds, its seat counters for `seats_ttl` seconds only, so
+    a lookup with fresh metadata and expired counters costs a probe of three columns by primary
+    key instead of the full row.
+
+    The endpoints of this worker that change events invalidate them explicitly: registration and
+    deletion the metadata, bookings the seat counters. The TTLs bound the staleness of changes
+    made by other workers.
+
+    A lookup that raced with an invalidation (the row was read before the write committed and
+    the invalidation happened before the row is stored) does not store what it read, so a
+    stale row can never outlive the invalidation. Each invalidation bumps a generation counter
+    that lookups compare before storing. The generations of the seat counters are kept for the
+    `max_size` events invalidated last, the events invalidated before them count as invalidated
+    at the generation of the last one dropped, so a lookup racing with them does not store.
+
+    Attributes
+
+    metadata (TTLCache):
+        Column values of the events without the seat counters, keyed by name.
+
+    seats (TTLCache):
+        Seat counters of the events, keyed by event id.
+    """
+
+    def __init__(self, max_size: int, ttl: float, seats_ttl: float):
+        self.metadata: TTLCache[str, dict] = TTLCache(max_size=max_size, ttl=ttl)
+        self.seats: TTLCache[int, dict] = TTLCache(max_size=max_size, ttl=seats_ttl)
+        self.max_size = max_size
+        self._metadata_generation = 0
+        self._seats_generation = 0
+        # Generation of the last invalidation of the seat counters of an event, oldest first
+        self._seats_invalidations: OrderedDict[int, int] = OrderedDict()
+        self._seats_forgotten = 0
+
+    async def get(self, session: AsyncSession, name: str) -> Optional[dict[str, Any]]:
+        """The column values of the event named `name`, None if there is no such event."""
+        metadata = self.metadata.get(name)
+        if metadata is None:
+            return await self._load_event(session, name)
+
+        event_id = metadata["id_"]
+        seats = self.seats.get(event_id)
+        if seats is None:
+            generation = self._seats_generation
+            result = await session.execute(EVENT_SEATS_BY_ID, {"id_": event_id})
+            row = result.one_or_none()
+            if row is None:
+                # Deleted by another worker
+                self.metadata.invalidate(name)
+                return None
+            seats = dict(row._mapping)
+            if self._seats_invalidated(event_id) <= generation:
+                self.seats.set(event_id, seats)
+        return {**metadata, **seats}
+
+    async def _load_event(self, session: AsyncSession, name: str) -> Optional[dict[str, Any]]:
+        metadata_generation = self._metadata_generation
+        result = await session.execute(EVENT_BY_NAME, {"name": name})
+        event_orm = result.scalar_one_or_none()
+        if event_orm is None:
+            return None
+
+        values = {attr.key: getattr(event_orm, attr.key) for attr in inspect(EventORM).column_attrs}
+        seats = {key: values.pop(key) for key in SEAT_COLUMNS}
+        if metadata_generation == self._metadata_generation:
+            self.metadata.set(name, values)
+            # The generation of the seats is only bumped by invalidations, which also bump the
+            # metadata generation when they happen before the row is read
+            self.seats.set(values["id_"], seats)
+        return {**values, **seats}
+
+    def _seats_invalidated(self, event_id: int) -> int:
+        """The generation of the last invalidation of the seat counters of an event."""
+        return self._seats_invalidations.get(event_id, self._seats_forgotten)
+
+    def invalidate_seats(self, event_id: int) -> None:
+        """Drop the seat counters of an event, after a booking changed them."""
+        self._seats_generation += 1
+        self._seats_invalidations.pop(event_id, None)
+        self._seats_invalidations[event_id] = self._seats_generation
+        if len(self._seats_invalidations) > self.max_size:
+            _, self._seats_forgotten = self._seats_invalidations.popitem(last=False)
+        self._metadata_generation += 1
+        self.seats.invalidate(event_id)
+
+    def invalidate(self, name: str, event_id: Optional[int] = None) -> None:
+        """Drop an event, after it was registered, changed or deleted."""
+        self._metadata_generation += 1
+        self.metadata.invalidate(name)
+        if event_id is not None:
+            self.invalidate_seats(event_id)
+
+    def clear(self) -> None:
+        self._metadata_generation += 1
+        self.metadata.clear()
+        self.seats.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"metadata": self.metadata.stats(), "seats": self.seats.stats()}
+
+
+event_cache = EventCache(
+    max_size=DBConfig.cache.get("event_max_size", default=1_000, cast=int),
+    ttl=DBConfig.cache.get("event_ttl_seconds", default=300, cast=float),
+    seats_ttl=DBConfig.cache.get("event_seats_ttl_seconds", default=2, cast=float),
+)
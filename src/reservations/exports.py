@@ -0,0 +1,64 @@
+# src/reservations/exports.py
+import csv
+import io
+from typing import AsyncIterator, Iterable, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import DBConfig
+from pyutils.timing import timed
+from src.enumerations import ExportFormat
+
+__all__ = ["CHUNK_SIZE", "MEDIA_TYPES", "export_columns", "stream_export"]
+
+CHUNK_SIZE = DBConfig.exports.get("chunk_size", default=1_000, cast=int)
+
+MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv"}
+
+
+def export_columns(response_model: Type[BaseModel]) -> list[str]:
+    """The keys of the serialized `response_model`, in order, the header of a CSV export."""
+    columns = [
+        field.serialization_alias or field.alias or name
+        for name, field in response_model.model_fields.items()
+        if not field.exclude
+    ]
+    return columns + list(response_model.model_computed_fields)
+
+
+def csv_lines(rows: Iterable[Iterable]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_export(
+    session: AsyncSession,
+    stmt: Select,
+    response_model: Type[BaseModel],
+    export_format: ExportFormat,
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Serialize the rows of `stmt` as `response_model`, one chunk of bytes per `chunk_size` rows.
+
+    The rows are read through a server-side cursor (`stream_results` with `yield_per`), and the
+    identity map of the session only holds weak references to the unmodified rows, so that one
+    chunk of rows at most is held in memory, however large the table is.
+    """
+    if export_format is ExportFormat.CSV:
+        yield csv_lines([export_columns(response_model)])
+
+    result = await session.stream_scalars(stmt, execution_options={"yield_per": chunk_size})
+    async for rows in result.partitions():
+        with timed("serialize"):
+            models = [response_model.model_validate(row) for row in rows]
+            if export_format is ExportFormat.NDJSON:
+                chunk = b"".join(
+                    model.__pydantic_serializer__.to_json(model) + b"\n" for model in models
+                )
+            else:
+                chunk = csv_lines(model.model_dump(mode="json").values() for model in models)
+        yield chunk
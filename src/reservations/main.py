@@ -1,36 +1,117 @@
 # src/reservations/main.py
-from fastapi import Depends, FastAPI, HTTPException, status
+import asyncio
+import contextlib
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.schema import AdminORM, UserORM
+from database.engine import engine, replica_engines, slow_queries
+from database.indexes import verify_indexes
+from database.pool import pool_stats
+from database.routing import replica_router
 from models.responses import TokenResponse
+from pyutils.metrics import CONTENT_TYPE
+from pyutils.queries import count_statements, query_budget
+from pyutils.timing import time_statements
+from src.enumerations import Role
 
-from .dependencies import open_async_session
+from .dependencies import cache_principal, lookup_principal, open_read_session
+from .metrics import MetricsMiddleware, monitor_event_loop_lag, registry
+from .principals import token_claims
+from .query_budgets import QueryBudgetMiddleware
 from .routers import routers
-from .security import create_access_token, verify_password
+from .security import HashingOverloadedError, create_access_token, password_hasher
+from .tasks import sweep_expired_holds
+from .timing import ServerTimingMiddleware
+
+logger = logging.getLogger(__name__)
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    try:
+        await verify_indexes(engine)
+    except SQLAlchemyError:
+        logger.exception("Could not verify the indexes of the database")
+    tasks = [
+        asyncio.create_task(sweep_expired_holds()),
+        asyncio.create_task(monitor_event_loop_lag()),
+    ]
+    if replica_router.replicas:
+        tasks.append(asyncio.create_task(replica_router.monitor()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        password_hasher.shutdown()
+        slow_queries.log_summary()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+time_statements()
+count_statements()
 
 for router in routers:
     app.include_router(router)
 
 
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(_request: Request, ex: HashingOverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(ex)},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Vounofasaious"}
 
 
+@app.get(
+    "/health/pool",
+    summary="Connection pool metrics",
+    description="""
+Occupancy of the connection pools of this worker (checked in and out connections, overflow) and
+checkout metrics since it started (checkouts, timeouts, total and longest wait on checkout).
+""",
+)
+def pool_health():
+    return {
+        "primary": pool_stats(engine),
+        "replicas": [pool_stats(replica) for replica in replica_engines],
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request, connection pool, cache and event loop metrics of this worker for Prometheus."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
 @app.post(
     "/login",
     response_model=TokenResponse,
     summary="Login with email and password (Swagger-compatible)",
     response_description="JWT access token, token type and the user record from the database",
 )
+@query_budget(1)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: AsyncSession = Depends(open_async_session),
+    session: AsyncSession = Depends(open_read_session),
 ):
     """
     Authenticate a user using **email and password**.
@@ -48,19 +129,14 @@ async def login(
     """
 
     # Swagger sends `username`, we treat it as `email`
-    result = await session.execute(select(UserORM).filter_by(email=form_data.username))
-    user = result.scalar_one_or_none()
-    if not user:
-        result = await session.execute(select(AdminORM).filter_by(email=form_data.username))
-        admin = result.scalar_one_or_none()
-        user = admin if admin else None
-
-    if not user or not verify_password(form_data.password, user.password):
+    principal = await lookup_principal(session, form_data.username)
+    if not principal or not await password_hasher.verify(form_data.password, principal.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
+    cache_principal(principal)
 
     # Create JWT
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(data=token_claims(principal, Role(principal.role)))
 
     return TokenResponse(access_token=access_token, token_type="bearer")
@@ -0,0 +1,172 @@
+# src/reservations/metrics.py
+import asyncio
+import time
+from typing import Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs import DBConfig
+from database.engine import engine, replica_engines
+from database.pool import pool_stats
+from pyutils import TTLCache
+from pyutils.metrics import Registry, Sample
+
+from .dependencies import principal_cache
+from .event_cache import event_cache
+from .principals import token_versions
+from .security import token_cache
+
+__all__ = [
+    "MetricsMiddleware",
+    "registry",
+    "monitor_event_loop_lag",
+    "LAG_INTERVAL_SECONDS",
+]
+
+# How often the event loop lag is measured
+LAG_INTERVAL_SECONDS = DBConfig.metrics.get("lag_interval_seconds", default=0.5, cast=float)
+
+# The requests that matched no route share one label, so that scans do not add series
+UNMATCHED = "unmatched"
+
+registry = Registry()
+
+requests_total = registry.counter(
+    "http_requests_total",
+    "Requests handled, by route template and status.",
+    ("method", "route", "status"),
+)
+request_errors_total = registry.counter(
+    "http_request_errors_total",
+    "Requests that failed with a server error, by route template.",
+    ("method", "route"),
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time in the app until the response is complete.",
+    ("method", "route"),
+)
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop in running a scheduled callback.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# The in-process caches of this worker
+CACHES: dict[str, TTLCache] = {
+    "principals": principal_cache,
+    "tokens": token_cache,
+    "token_versions": token_versions._versions,
+    "event_metadata": event_cache.metadata,
+    "event_seats": event_cache.seats,
+}
+
+
+def engines() -> Iterator[tuple[str, dict]]:
+    yield "primary", pool_stats(engine)
+    for replica in replica_engines:
+        yield "replica", pool_stats(replica)
+
+
+def pool_samples(key: str) -> Iterator[Sample]:
+    for role, stats in engines():
+        if key in stats:
+            yield (role, str(stats["host"])), stats[key]
+
+
+def cache_samples(key: str) -> Iterator[Sample]:
+    for name, cache in CACHES.items():
+        yield (name,), cache.stats()[key]
+
+
+for _name, _key, _kind, _documentation in (
+    ("db_pool_size", "size", "gauge", "Connections the pool keeps open."),
+    ("db_pool_checked_out", "checked_out", "gauge", "Connections in use."),
+    ("db_pool_checked_in", "checked_in", "gauge", "Idle connections in the pool."),
+    ("db_pool_overflow", "overflow", "gauge", "Connections open beyond the pool size."),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Checkouts that returned a connection."),
+    (
+        "db_pool_checkout_timeouts_total",
+        "checkout_timeouts",
+        "counter",
+        "Checkouts that timed out.",
+    ),
+    (
+        "db_pool_checkout_wait_seconds_total",
+        "checkout_wait_seconds_total",
+        "counter",
+        "Total wait of the checkouts.",
+    ),
+    (
+        "db_pool_checkout_wait_seconds_max",
+        "checkout_wait_seconds_max",
+        "gauge",
+        "Longest wait of a checkout.",
+    ),
+):
+    registry.callback(
+        _name, _documentation, lambda key=_key: pool_samples(key), ("engine", "host"), _kind
+    )
+
+for _name, _key, _kind, _documentation in (
+    ("cache_hits_total", "hits", "counter", "Lookups served by the cache."),
+    ("cache_misses_total", "misses", "counter", "Lookups missed by the cache."),
+    ("cache_hit_ratio", "hit_ratio", "gauge", "Share of the lookups served by the cache."),
+    ("cache_size", "size", "gauge", "Entries in the cache."),
+    ("cache_evictions_total", "evictions", "counter", "Entries evicted by the size limits."),
+):
+    registry.callback(_name, _documentation, lambda key=_key: cache_samples(key), ("cache",), _kind)
+
+
+class MetricsMiddleware:
+    """
+    Description
+
+    Counts the requests by route template and status, the server errors by route template, and
+    records the time in the app until the response is complete in a latency histogram.
+
+    The route template (e.g. `/exports/{resource}`) rather than the path keeps the number of
+    series bounded, the requests that matched no route are all labelled `unmatched`. A request
+    that raised is recorded as a 500.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            method = scope["method"]
+            requests_total.inc((method, route, str(status_code)))
+            request_duration.observe(elapsed, (method, route))
+            if status_code >= 500:
+                request_errors_total.inc((method, route))
+
+
+async def monitor_event_loop_lag(interval: float = LAG_INTERVAL_SECONDS) -> None:
+    """
+    Background task that measures how late the event loop wakes up from a sleep of `interval`
+    seconds, the time callbacks wait behind blocking work (e.g. CPU bound code in a coroutine).
+    It only stops when cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(loop.time() - start - interval, 0.0))
@@ -0,0 +1,81 @@
+# src/reservations/pagination.py
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Type, TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import DBConfig
+from database.base import TimestampBase
+from models.responses import Page
+
+__all__ = ["PageParams", "encode_cursor", "decode_cursor", "paginate"]
+
+DEFAULT_PAGE_SIZE = DBConfig.pagination.get("default_page_size", default=50, cast=int)
+MAX_PAGE_SIZE = DBConfig.pagination.get("max_page_size", default=500, cast=int)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@dataclass
+class PageParams:
+    """Query parameters of a keyset paginated listing."""
+
+    cursor: Optional[str] = Query(None, description="Opaque cursor of the page to fetch")
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+
+
+def encode_cursor(created_at: datetime, id_: int) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), id_], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException (400): If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id_ = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id_)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    orm_class: Type[TimestampBase],
+    response_model: Type[M],
+    params: PageParams,
+) -> Page[M]:
+    """
+    Fetch one page of `stmt` with keyset pagination on (created_at, id).
+
+    The rows are ordered by (created_at, id) and a page starts right after the sort key carried
+    by the cursor, so with an index on (created_at, id) every page is an index range scan of
+    `limit` rows, no matter how deep it is (OFFSET would scan and discard all previous rows).
+    One extra row is fetched to know whether a next page exists.
+    """
+    sort_key = tuple_(orm_class.created_at, orm_class.id_)
+    stmt = stmt.order_by(orm_class.created_at, orm_class.id_).limit(params.limit + 1)
+    if params.cursor is not None:
+        stmt = stmt.where(sort_key > tuple_(*decode_cursor(params.cursor)))
+
+    rows = (await session.execute(stmt)).scalars().all()
+    has_next = len(rows) > params.limit
+    rows = rows[: params.limit]
+
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id_) if has_next else None
+    return Page[response_model](
+        items=[response_model.model_validate(row) for row in rows], next_cursor=next_cursor
+    )
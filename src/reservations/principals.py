@@ -0,0 +1,85 @@
+# src/reservations/principals.py
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from database.schema import AdminORM, UserORM
+from pyutils import TTLCache
+from reservations.security import ACCESS_TOKEN_EXPIRE_MINUTES, STATELESS_TOKENS
+from src.enumerations import Role
+
+__all__ = ["Principal", "TokenVersions", "token_versions", "token_claims", "principal_from_claims"]
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated caller, as far as it can be known without loading its database row."""
+
+    id_: int
+    email: str
+    role: Role
+    token_version: int = 0
+
+
+class TokenVersions:
+    """
+    Description
+
+    The latest token version of each user and admin known by this worker, keyed by role and id
+    since users and admins are numbered separately. Tokens carrying an older version are
+    revoked without a per-request lookup.
+
+    Versions are recorded when this worker bumps them and whenever it loads a user row, so other
+    workers learn about a bump on their next database load of the user. Deleting a principal
+    records the version after its last one, which revokes all its tokens. Entries only need to
+    live as long as the tokens they revoke, so they expire with ACCESS_TOKEN_EXPIRE_MINUTES.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        self._versions: TTLCache[tuple[Role, int], int] = TTLCache(
+            max_size=max_size, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+
+    def observe(self, role: Role, id_: int, version: int) -> None:
+        latest = self._versions.get((role, id_))
+        if latest is None or version > latest:
+            self._versions.set((role, id_), version)
+
+    def is_revoked(self, principal: Principal) -> bool:
+        latest = self._versions.get((principal.role, principal.id_))
+        return latest is not None and principal.token_version < latest
+
+
+token_versions = TokenVersions()
+
+
+def token_claims(orm: Union[UserORM, AdminORM], role: Role) -> dict:
+    """
+    Build the claims of an access token. With STATELESS_TOKENS the token also carries the id,
+    the role and the token version, otherwise only the email as `sub`.
+    """
+    claims = {"sub": orm.email}
+    if STATELESS_TOKENS:
+        claims.update(uid=orm.id_, role=role.value, ver=getattr(orm, "token_version", None) or 0)
+    return claims
+
+
+def principal_from_claims(payload: dict) -> Optional[Principal]:
+    """
+    Build the principal from the claims of a decoded token.
+
+    Returns:
+        Principal | None: None if stateless tokens are disabled or the token does not carry the
+        `uid` and `role` claims, in which case the caller has to be resolved from the database.
+
+    Raises:
+        ValueError: If the claims are present but malformed.
+    """
+    if not STATELESS_TOKENS or "uid" not in payload or "role" not in payload:
+        return None
+
+    return Principal(
+        id_=int(payload["uid"]),
+        email=payload["sub"],
+        role=Role(payload["role"]),
+        token_version=int(payload.get("ver", 0)),
+    )
@@ -0,0 +1,78 @@
+# src/reservations/query_budgets.py
+import logging
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from configs import DBConfig
+from pyutils.queries import (
+    REPEAT_LIMIT,
+    QueryBudgetExceeded,
+    QueryLog,
+    current_query_log,
+)
+
+__all__ = ["QueryBudgetMiddleware", "BUDGET_ACTION", "REPEAT_LIMIT_PER_REQUEST"]
+
+logger = logging.getLogger(__name__)
+
+# "warn" logs the requests over budget, "raise" fails them (the test fixtures switch to it)
+BUDGET_ACTION = DBConfig.queries.get("budget_action", default="warn")
+if BUDGET_ACTION not in ("warn", "raise"):
+    raise ValueError(f"Invalid query budget action: {BUDGET_ACTION}")
+# Executions of the same statement shape per request beyond which it is reported as N+1
+REPEAT_LIMIT_PER_REQUEST = DBConfig.queries.get("repeat_limit", default=REPEAT_LIMIT, cast=int)
+
+
+class QueryBudgetMiddleware:
+    """
+    Description
+
+    Counts the statements of every request (recorded by the cursor hooks of
+    `pyutils.queries.count_statements`) and checks them once the response is complete: against
+    the budget the endpoint declares with `pyutils.queries.query_budget`, if any, and for
+    repeated executions of the same statement, the signature of an N+1 (e.g. a lazy load per
+    row).
+
+    A request over budget is logged as a warning by the `reservations.query_budgets` logger, or
+    with the "raise" action fails with `QueryBudgetExceeded`, so that a test client sees it.
+
+    Attributes
+
+    action (str | None):
+        "warn" or "raise", None follows `BUDGET_ACTION` at the time of the request.
+
+    repeat_limit (int):
+        Executions of the same statement shape allowed per request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        action: Optional[str] = None,
+        repeat_limit: int = REPEAT_LIMIT_PER_REQUEST,
+    ):
+        self.app = app
+        self.action = action
+        self.repeat_limit = repeat_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog(parent=current_query_log.get())
+        token = current_query_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_log.reset(token)
+
+        budget = getattr(scope.get("endpoint"), "query_budget", None)
+        problems = log.violations(budget, self.repeat_limit)
+        if not problems:
+            return
+        message = f"{scope['method']} {scope['path']}: {'; '.join(problems)}"
+        if (self.action or BUDGET_ACTION) == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
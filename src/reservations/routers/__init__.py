@@ -1,9 +1,18 @@
 # src/reservations/routers/__init__.py
 
 from .admins import router as admins_router
+from .bookings import router as bookings_router
 from .events import router as events_router
+from .exports import router as exports_router
 from .users import router as users_router
 
-routers = [users_router, admins_router, events_router]
+routers = [users_router, admins_router, events_router, bookings_router, exports_router]
 
-__all__ = ["users_router", "admins_router", "events_router", "routers"]
+__all__ = [
+    "users_router",
+    "admins_router",
+    "events_router",
+    "bookings_router",
+    "exports_router",
+    "routers",
+]
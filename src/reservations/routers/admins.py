@@ -1,16 +1,17 @@
 # src/reservations/routers/admins.py
-from typing import Optional
-
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.schema import AdminORM
+from database.utils import is_duplicate_key
 from models.responses import TokenResponse
 from models.schema import AdminModel
-from reservations.dependencies import open_async_session
-from reservations.security import create_access_token, hash_password
+from pyutils.queries import query_budget
+from reservations.dependencies import invalidate_principal, open_async_session
+from reservations.principals import token_claims
+from reservations.security import create_access_token, password_hasher
+from src.enumerations import Role
 
 router = APIRouter(prefix="/admins", tags=["admins"])
 
@@ -39,27 +40,27 @@ Example:
     }
              """,
 )
+@query_budget(1)
 async def register(
     admin: AdminModel, session: AsyncSession = Depends(open_async_session)
 ) -> TokenResponse:
-    result = await session.execute(select(AdminORM).filter_by(email=admin.email))
-    existing_admin: Optional[AdminORM] = result.scalar_one_or_none()
-    if existing_admin:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User with email '{admin.email}' already exists.",
-        )
+    admin_orm = AdminORM.from_attributes(admin, include=["password"])
+    admin_orm.password = await password_hasher.hash(admin.password)
+    session.add(admin_orm)
     try:
-        admin_orm = AdminORM.from_attributes(admin, include=["password"]).cast(
-            attr="password", callable=hash_password
-        )
-        session.add(admin_orm)
-        await session.flush()
+        # The unique email index rejects existing emails, no lookup beforehand and no refresh
         await session.commit()
-        await session.refresh(admin_orm)
-
-        token = create_access_token({"sub": admin_orm.email})
-
+    except IntegrityError as e:
+        await session.rollback()
+        if is_duplicate_key(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"User with email '{admin.email}' already exists.",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error during admin insertion: {str(e)}",
+        )
     except SQLAlchemyError as e:
         await session.rollback()
         raise HTTPException(
@@ -67,6 +68,8 @@ async def register(
             detail=f"Database error during admin insertion: {str(e)}",
         )
 
+    invalidate_principal("admin", admin_orm.email)
+    token = create_access_token(token_claims(admin_orm, Role.ADMIN))
     return TokenResponse(
         access_token=token, token_type="bearer", admin=AdminModel.model_validate(admin_orm)
     )
@@ -0,0 +1,157 @@
+# src/reservations/routers/bookings.py
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs import DBConfig
+from database.bookings import NotEnoughSeatsError, confirm_hold, hold_seats
+from database.schema import BookingORM, EventORM
+from database.utils import is_missing_reference
+from models.bookings import BookingHold
+from models.responses import BookingResponse, Page
+from pyutils.queries import query_budget
+from reservations.dependencies import (
+    open_async_session,
+    open_read_session,
+    require_admin,
+    require_user,
+)
+from reservations.event_cache import event_cache
+from reservations.pagination import PageParams, paginate
+from reservations.principals import Principal, token_versions
+from src.enumerations import EventStatus, Role
+
+router = APIRouter(prefix="/bookings", tags=["bookings"])
+
+HOLD_TTL = timedelta(seconds=DBConfig.bookings.get("hold_ttl_seconds", default=600, cast=int))
+
+
+@router.post(
+    "/hold",
+    response_model=BookingResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Hold seats of an event",
+    description=f"""
+Place a time-limited hold on seats of an active event.
+
+The seats are reserved immediately and the booking is created as **pending**. The hold must be
+confirmed within {int(HOLD_TTL.total_seconds())} seconds, otherwise it expires and its seats
+are given back to the event.
+
+Example:
+
+    {{
+      "event_name": "Beach Getaway",\n
+      "seats": 2
+    }}
+""",
+    responses={
+        status.HTTP_201_CREATED: {"description": "Seats held successfully"},
+        status.HTTP_401_UNAUTHORIZED: {"description": "The user no longer exists"},
+        status.HTTP_404_NOT_FOUND: {"description": "Event not found"},
+        status.HTTP_409_CONFLICT: {"description": "Not enough available seats"},
+    },
+)
+@query_budget(4)
+async def hold(
+    booking_hold: BookingHold,
+    current_user: Principal = Depends(require_user),
+    session: AsyncSession = Depends(open_async_session),
+) -> BookingResponse:
+    result = await session.execute(
+        select(EventORM.id_, EventORM.price_per_seat).filter_by(
+            name=booking_hold.event_name, status=EventStatus.ACTIVE
+        )
+    )
+    event = result.one_or_none()
+    if event is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+
+    event_id, price_per_seat = event
+    booking_orm = BookingORM(
+        user_id=current_user.id_,
+        event_id=event_id,
+        unit_price=price_per_seat,
+        seats=booking_hold.seats,
+    )
+    try:
+        await hold_seats(session, booking_orm, ttl=HOLD_TTL)
+        # Commit right away, the event row must not stay locked while the hold is pending
+        await session.commit()
+    except NotEnoughSeatsError as e:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError as e:
+        await session.rollback()
+        if is_missing_reference(e):
+            # The user was deleted after its token was issued (e.g. through another worker), the
+            # event row is locked by the reservation of its seats
+            token_versions.observe(Role.USER, current_user.id_, current_user.token_version + 1)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"No user found with id: {current_user.id_}",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error during the hold: {str(e)}",
+        )
+    event_cache.invalidate_seats(event_id)
+
+    return BookingResponse.model_validate(booking_orm)
+
+
+@router.post(
+    "/{booking_id}/confirm",
+    response_model=BookingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Confirm a seat hold",
+    description="Confirm a pending seat hold of the current user, the booking becomes active.",
+    responses={
+        status.HTTP_200_OK: {"description": "Booking confirmed"},
+        status.HTTP_410_GONE: {"description": "Hold not found, already confirmed or expired"},
+    },
+)
+@query_budget(3)
+async def confirm(
+    booking_id: int,
+    current_user: Principal = Depends(require_user),
+    session: AsyncSession = Depends(open_async_session),
+) -> BookingResponse:
+    confirmed = await confirm_hold(session, booking_id=booking_id, user_id=current_user.id_)
+    if not confirmed:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Seat hold not found, already confirmed or expired",
+        )
+
+    await session.commit()
+    booking_orm = await session.get(BookingORM, booking_id)
+    return BookingResponse.model_validate(booking_orm)
+
+
+@router.get(
+    "/",
+    response_model=Page[BookingResponse],
+    status_code=status.HTTP_200_OK,
+    summary="List bookings",
+    description="""
+Returns a page of bookings ordered by creation time. Restricted to administrators.
+
+Pass the `next_cursor` of a page as `cursor` to fetch the next one, it is null on the last page.
+""",
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"description": "Authentication required"},
+        status.HTTP_403_FORBIDDEN: {"description": "Admins only"},
+    },
+)
+@query_budget(2)
+async def list_bookings(
+    params: PageParams = Depends(),
+    session: AsyncSession = Depends(open_read_session),
+    _current_admin: Principal = Depends(require_admin),
+) -> Page[BookingResponse]:
+    return await paginate(session, select(BookingORM), BookingORM, BookingResponse, params)
@@ -1,38 +1,195 @@
 # src/reservations/routers/events.py
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import PlainTextResponse
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from configs import DBConfig
+from database.queries import (
+    EVENT_BY_NAME,
+    EVENTS_BY_IDS,
+    EVENTS_BY_NAMES,
+    search_events,
+)
+from database.routing import reading
 from database.schema import EventORM
-from models.responses import EventResponse
-from models.schema import AdminModel, EventModel
-from reservations.dependencies import get_current_admin, open_async_session
+from models.events import MAX_BATCH_SIZE, EventBatch, EventSearch
+from models.responses import EventLookup, EventResponse, Page
+from models.schema import EventModel
+from pyutils import SingleFlight
+from pyutils.queries import query_budget
+from reservations.conditional import if_none_match, make_etag
+from reservations.dependencies import (
+    open_async_session,
+    open_read_session,
+    reads_from_primary,
+    require_admin,
+)
+from reservations.event_cache import event_cache
+from reservations.pagination import PageParams, paginate
+from reservations.principals import Principal
+from reservations.rendering import ModelResponse
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+EVENT_CACHE_CONTROL = "public, max-age={}, must-revalidate".format(
+    DBConfig.cache.get("event_max_age_seconds", default=5, cast=int)
+)
+
+
+# Concurrent identical reads share one lookup, keyed by what the response depends on (and
+# whether the client reads from the primary). The body of an event is serialized once for all
+# the concurrent requests of the same representation, keyed by its ETag, and only for the
+# requests that are not answered with a 304.
+event_reads: SingleFlight[tuple, Optional[tuple[str, dict]]] = SingleFlight()
+event_bodies: SingleFlight[str, bytes] = SingleFlight()
+event_pages: SingleFlight[tuple, bytes] = SingleFlight()
+
+
+def event_etag(id_: int, updated_at: datetime, reserved_seats: int) -> str:
+    # updated_at has a one second resolution, the seat counter tells bookings of the same second
+    return make_etag(id_, updated_at.isoformat(), reserved_seats)
+
+
+async def read_event(name: str, primary: bool) -> Optional[tuple[str, dict]]:
+    """The ETag and the column values of the event named `name`, None if there is no such event."""
+    async with reading(primary=primary) as session:
+        event = await event_cache.get(session, name)
+    if event is None:
+        return None
+    return event_etag(event["id_"], event["updated_at"], event["reserved_seats"]), event
+
+
+async def render_event(event: dict) -> bytes:
+    return EventResponse.model_validate(event).model_dump_json().encode()
+
+
+async def read_events_page(params: PageParams, primary: bool) -> bytes:
+    async with reading(primary=primary) as session:
+        page = await paginate(session, select(EventORM), EventORM, EventResponse, params)
+    return page.model_dump_json().encode()
+
 
 @router.get(
     "",
-    response_model=EventResponse,
     status_code=status.HTTP_200_OK,
     summary="Get event by name",
+    description="""
+Returns the event with the given name, with an `ETag` and `Cache-Control` header.
+
+Send the ETag back in `If-None-Match` to revalidate: if the event did not change the response is
+a 304 Not Modified without body.
+""",
     responses={
-        status.HTTP_200_OK: {"Description": "Event found"},
+        status.HTTP_200_OK: {"Description": "Event found", "model": EventResponse},
+        status.HTTP_304_NOT_MODIFIED: {"Description": "Event not modified"},
         status.HTTP_404_NOT_FOUND: {"Description": "Event not found"},
     },
 )
-async def get_event_by_name(
-    event_name: str, session: AsyncSession = Depends(open_async_session)
-) -> EventResponse:
-    result = await session.execute(select(EventORM).filter_by(name=event_name))
-    event_orm = result.scalar_one_or_none()
-    if not event_orm:
+@query_budget(1)
+async def get_event_by_name(event_name: str, request: Request) -> ModelResponse:
+    primary = reads_from_primary(request)
+    read = await event_reads.do((event_name, primary), lambda: read_event(event_name, primary))
+    if read is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    event_response = EventResponse.model_validate(event_orm)
-    return event_response
+    etag, event = read
+    headers = {"ETag": etag, "Cache-Control": EVENT_CACHE_CONTROL}
+    if if_none_match(request, etag):
+        # Neither validated nor serialized
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = await event_bodies.do(etag, lambda: render_event(event))
+    return ModelResponse(body, headers=headers)
+
+
+@router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    summary="List events",
+    description="""
+Returns a page of events ordered by creation time.
+
+Pass the `next_cursor` of a page as `cursor` to fetch the next one, it is null on the last page.
+""",
+    responses={status.HTTP_200_OK: {"model": Page[EventResponse]}},
+)
+@query_budget(1)
+async def list_events(request: Request, params: PageParams = Depends()) -> ModelResponse:
+    primary = reads_from_primary(request)
+    body = await event_pages.do(
+        (params.cursor, params.limit, primary), lambda: read_events_page(params, primary)
+    )
+    return ModelResponse(body)
+
+
+@router.get(
+    "/search",
+    response_model=list[EventResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Search events",
+    description="""
+Search events by destination, start location, date range, status and minimum free seats.
+
+Every criterion is optional, only active events are returned unless `status` is given. The events
+start on or after `date_from` and end on or before `date_to`, they are ordered by start date.
+""",
+)
+@query_budget(1)
+async def search(
+    criteria: Annotated[EventSearch, Query()],
+    session: AsyncSession = Depends(open_read_session),
+) -> list[EventResponse]:
+    result = await session.execute(search_events(**criteria.model_dump()))
+    return [EventResponse.model_validate(event_orm) for event_orm in result.scalars()]
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Get events by names or ids",
+    description=f"""
+Returns the events with the given names, or with the given ids, up to {MAX_BATCH_SIZE} per
+request, in a single query.
+
+The results are in the order of the request, one per name or id. An event that does not exist
+has `found` set to false and a null `event`.
+
+Example:
+
+    {{
+      "names": ["Beach Getaway", "Mountain Retreat"]
+    }}
+""",
+    responses={status.HTTP_200_OK: {"model": list[EventLookup]}},
+)
+@query_budget(1)
+async def get_events_batch(
+    batch: EventBatch, session: AsyncSession = Depends(open_read_session)
+) -> ModelResponse:
+    if batch.names is not None:
+        result = await session.execute(EVENTS_BY_NAMES, {"names": batch.names})
+        # Names compare case-insensitively in MySQL, as in the lookup of a single event
+        events = {event_orm.name.casefold(): event_orm for event_orm in result.scalars()}
+        matches = [(name, events.get(name.casefold())) for name in batch.names]
+    else:
+        result = await session.execute(EVENTS_BY_IDS, {"ids": batch.ids})
+        events = {event_orm.id_: event_orm for event_orm in result.scalars()}
+        matches = [(id_, events.get(id_)) for id_ in batch.ids]
+
+    return ModelResponse(
+        [
+            EventLookup(
+                key=key,
+                found=event_orm is not None,
+                event=EventResponse.model_validate(event_orm) if event_orm is not None else None,
+            )
+            for key, event_orm in matches
+        ]
+    )
 
 
 @router.post(
@@ -71,21 +228,22 @@ Example: \n
         status.HTTP_401_UNAUTHORIZED: {"description": "Authentication required"},
     },
 )
+@query_budget(2)
 async def register(
     event_model: EventModel,
     session: AsyncSession = Depends(open_async_session),
-    _current_admin: AdminModel = Depends(get_current_admin),
+    _current_admin: Principal = Depends(require_admin),
 ) -> EventResponse:
     event_orm = EventORM.from_attributes(event_model)
     try:
         session.add(event_orm)
-        await session.flush()
+        # The response only reads columns set client side, no refresh needed
         await session.commit()
     except SQLAlchemyError as e:
+        await session.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    await session.refresh(event_orm)
-
+    event_cache.invalidate(event_orm.name)
     return EventResponse.model_validate(event_orm)
 
 
@@ -99,8 +257,9 @@ async def register(
         status.HTTP_404_NOT_FOUND: {"description": "Invalid input or event creation failed"},
     },
 )
+@query_budget(3)
 async def delete_event(
-    _get_current_admin: AdminModel = Depends(get_current_admin),
+    _get_current_admin: Principal = Depends(require_admin),
     session: AsyncSession = Depends(open_async_session),
     event_name: str = Query(
         ...,
@@ -109,12 +268,13 @@ async def delete_event(
         description="Name of the event to delete",
     ),
 ) -> PlainTextResponse:
-    result = await session.execute(select(EventORM).filter_by(name=event_name))
+    result = await session.execute(EVENT_BY_NAME, {"name": event_name})
     event_orm = result.scalar_one_or_none()
 
     if event_orm:
         await session.delete(event_orm)
         await session.commit()
+        event_cache.invalidate(event_name, event_orm.id_)
         return PlainTextResponse(
             f"Event with name {event_name} successfully deleted.",
             status_code=status.HTTP_204_NO_CONTENT,
@@ -0,0 +1,71 @@
+# src/reservations/routers/exports.py
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from database.routing import reading
+from database.schema import BookingORM, EventORM, PaymentORM, UserORM
+from models.responses import BookingResponse, EventResponse, UserResponse
+from models.schema import PaymentModel
+from pyutils.queries import query_budget
+from reservations.dependencies import reads_from_primary, require_admin
+from reservations.exports import MEDIA_TYPES, stream_export
+from reservations.principals import Principal
+from src.enumerations import ExportFormat
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+# The table and the serialization of every exportable resource
+EXPORTS = {
+    "users": (UserORM, UserResponse),
+    "events": (EventORM, EventResponse),
+    "bookings": (BookingORM, BookingResponse),
+    "payments": (PaymentORM, PaymentModel),
+}
+
+
+@router.get(
+    "/{resource}",
+    status_code=status.HTTP_200_OK,
+    summary="Export a whole table",
+    description="""
+Streams every user, event, booking or payment, ordered by id, as newline delimited JSON (one
+object per line, the same as the other endpoints return) or as CSV with a header line.
+Restricted to administrators.
+
+The rows are read through a server-side cursor and sent chunk by chunk, the export can be
+consumed while it is produced.
+""",
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+            "description": "The rows of the table",
+        },
+        status.HTTP_401_UNAUTHORIZED: {"description": "Authentication required"},
+        status.HTTP_403_FORBIDDEN: {"description": "Admins only"},
+    },
+)
+@query_budget(2)
+async def export(
+    resource: Literal["users", "events", "bookings", "payments"],
+    request: Request,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    _current_admin: Principal = Depends(require_admin),
+) -> StreamingResponse:
+    orm_class, response_model = EXPORTS[resource]
+    stmt = select(orm_class).order_by(orm_class.id_)
+    primary = reads_from_primary(request)
+
+    # The session of a dependency is closed before the response is sent, the stream needs its own
+    async def chunks():
+        async with reading(primary=primary) as session:
+            async for chunk in stream_export(session, stmt, response_model, export_format):
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{export_format.value}"'},
+    )
@@ -5,15 +5,28 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import PlainTextResponse
 from pydantic import EmailStr
 from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from database.queries import USER_BY_EMAIL
 from database.schema import AddressORM, UserORM
-from models.responses import TokenResponse, UserResponse
+from database.utils import is_duplicate_key
+from models.responses import Page, TokenResponse, UserResponse
 from models.schema import UserModel
 from models.users import UserLogin, UserUpdateModel
-from reservations.dependencies import get_current_user, open_async_session
-from reservations.security import create_access_token, hash_password, verify_password
+from pyutils.queries import query_budget
+from reservations.dependencies import (
+    cache_principal,
+    get_current_user,
+    invalidate_principal,
+    lookup_principal,
+    open_async_session,
+    open_read_session,
+)
+from reservations.pagination import PageParams, paginate
+from reservations.principals import token_claims, token_versions
+from reservations.security import create_access_token, password_hasher
+from src.enumerations import Role
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -39,17 +52,22 @@ router = APIRouter(prefix="/users", tags=["users"])
     }
 """,
 )
-async def login(user: UserLogin, session: AsyncSession = Depends(open_async_session)):
-    result = await session.execute(select(UserORM).filter_by(email=user.email))
-    user_orm = result.scalar_one_or_none()
-    if not user_orm or not verify_password(user.password, user_orm.password):
+@query_budget(1)
+async def login(user: UserLogin, session: AsyncSession = Depends(open_read_session)):
+    principal = await lookup_principal(session, user.email)
+    if (
+        not principal
+        or principal.role != Role.USER.value
+        or not await password_hasher.verify(user.password, principal.password)
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password"
         )
+    cache_principal(principal)
 
-    token = create_access_token(data={"sub": user_orm.email})
+    token = create_access_token(data=token_claims(principal, Role.USER))
     return TokenResponse(
-        access_token=token, token_type="bearer", user=UserResponse.model_validate(user_orm)
+        access_token=token, token_type="bearer", user=UserResponse.model_validate(principal)
     )
 
 
@@ -95,41 +113,40 @@ Example:
         status.HTTP_400_BAD_REQUEST: {"description": "User with email already exists"},
     },
 )
+@query_budget(2)
 async def register(
     user: UserModel, session: AsyncSession = Depends(open_async_session)
 ) -> TokenResponse:
-    # Check if email exists
-    result = await session.execute(select(UserORM).filter_by(email=user.email))
-    existing_user: Optional[UserORM] = result.scalar_one_or_none()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User with email '{user.email}' already exists.",
-        )
+    user_orm = UserORM.from_attributes(user, include=["password"])
+    user_orm.password = await password_hasher.hash(user.password)
+    if user.address:
+        # Inserted right after the user by the same flush, with the generated user id
+        user_orm.address = AddressORM.from_attributes(user.address)
+    session.add(user_orm)
     try:
-        user_orm = UserORM.from_attributes(user, include=["password"]).cast(
-            attr="password", callable=hash_password
-        )
-        session.add(user_orm)
-        await session.flush()  # get user_orm.id
-
-        if user.address:
-            address_orm = AddressORM.from_attributes(user.address)
-            address_orm.user_id = user_orm.id
-            session.add(address_orm)
-            await session.flush()
-
+        # The unique email index rejects existing emails, no need for a lookup beforehand. All the
+        # generated values but the id (read from the INSERT result) are set client side, so the
+        # response is built from the in-memory user without a refresh.
         await session.commit()
-        await session.refresh(user_orm)
-        # Step 4: Generate JWT token
-        token = create_access_token({"sub": user_orm.email})
-
+    except IntegrityError as e:
+        await session.rollback()
+        if is_duplicate_key(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"User with email '{user.email}' already exists.",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error during user insertion: {str(e)}",
+        )
     except SQLAlchemyError as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error during user insertion: {str(e)}",
         )
+
+    token = create_access_token(token_claims(user_orm, Role.USER))
     return TokenResponse(
         access_token=token, token_type="bearer", user=UserResponse.model_validate(user_orm)
     )
@@ -173,16 +190,18 @@ Example:\n
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Database error"},
     },
 )
+@query_budget(4)
 async def update_current_user(
     update_data: UserUpdateModel,
     current_user: UserORM = Depends(get_current_user),
     session: AsyncSession = Depends(open_async_session),
 ):
     # Check for email change and uniqueness
+    current_email = current_user.email
     new_fields = update_data.model_dump(exclude_unset=True)
     new_email = new_fields.get("email", None)
     if new_email and new_email != current_user.email:
-        result = await session.execute(select(UserORM).filter_by(email=new_email))
+        result = await session.execute(USER_BY_EMAIL, {"email": new_email})
         email_exists = result.scalar_one_or_none()
         if email_exists:
             raise HTTPException(
@@ -192,11 +211,16 @@ async def update_current_user(
     try:
         for field, value in new_fields.items():
             setattr(current_user, field, value)
+        # Changing the email revokes the tokens issued for the old one
+        if current_user.email != current_email:
+            current_user.token_version += 1
 
         await session.commit()
+        invalidate_principal("user", current_email)
+        token_versions.observe(Role.USER, current_user.id_, current_user.token_version)
         await session.refresh(current_user)
 
-        token = create_access_token({"sub": current_user.email})
+        token = create_access_token(token_claims(current_user, Role.USER))
         return TokenResponse(
             access_token=token, token_type="bearer", user=UserResponse.model_validate(current_user)
         )
@@ -218,6 +242,7 @@ async def update_current_user(
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Database error"},
     },
 )
+@query_budget(2)
 async def delete_me(
     current_user: UserORM = Depends(get_current_user),
     session: AsyncSession = Depends(open_async_session),
@@ -225,6 +250,9 @@ async def delete_me(
     try:
         await session.delete(current_user)
         await session.commit()
+        invalidate_principal("user", current_user.email)
+        # Revokes the stateless tokens of the user, which would not need its row otherwise
+        token_versions.observe(Role.USER, current_user.id_, current_user.token_version + 1)
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -242,14 +270,19 @@ async def delete_me(
 
 @router.get(
     "/",
-    response_model=list[UserResponse],
+    response_model=Page[UserResponse],
     summary="List users",
-    description="Returns up to 100 users from the database. Intended for development/debugging.",
+    description="""
+Returns a page of users ordered by creation time. Intended for development/debugging.
+
+Pass the `next_cursor` of a page as `cursor` to fetch the next one, it is null on the last page.
+""",
 )
-async def list_users(session: AsyncSession = Depends(open_async_session)) -> list[UserResponse]:
-    result = await session.execute(select(UserORM).limit(100))
-    users = result.scalars()
-    return [UserResponse.model_validate(user) for user in users]
+@query_budget(1)
+async def list_users(
+    params: PageParams = Depends(), session: AsyncSession = Depends(open_read_session)
+) -> Page[UserResponse]:
+    return await paginate(session, select(UserORM), UserORM, UserResponse, params)
 
 
 @router.delete(
@@ -265,6 +298,7 @@ async def list_users(session: AsyncSession = Depends(open_async_session)) -> lis
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal database error"},
     },
 )
+@query_budget(1)
 async def delete_all_users(
     session: AsyncSession = Depends(open_async_session),
 ) -> PlainTextResponse:
@@ -282,9 +316,9 @@ async def delete_all_users(
 
 # ===================== Common Functionalities about users ===========
 async def get_user_by_email(
-    email: EmailStr, session: AsyncSession = Depends(open_async_session)
+    email: EmailStr, session: AsyncSession = Depends(open_read_session)
 ) -> UserORM:
-    result = await session.execute(select(UserORM).filter_by(email=email))
+    result = await session.execute(USER_BY_EMAIL, {"email": email})
     user: Optional[UserORM] = result.scalar_one_or_none()
     if not user:
         raise HTTPException(
@@ -1,9 +1,20 @@
 # src/reservations/security.py
+import asyncio
+import hashlib
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
+from typing import Any, Callable, Optional
 
 import jwt
 from passlib.hash import argon2
 
+from configs import DBConfig, bool_
+from pyutils import TTLCache
+from pyutils.timing import timed
+
 # -------------------------------
 # CONFIGURATION VARIABLES
 # -------------------------------
@@ -14,6 +25,15 @@ SECRET_KEY = "your-very-long-random-secret-key"
 ALGORITHM = "HS256"
 # Token expiration in minutes
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Opt-in token format carrying the user id, role and token version (no DB lookup to authenticate)
+STATELESS_TOKENS = DBConfig.security.get("stateless_tokens", default=False, cast=bool_)
+# Bounds of the cache of verified tokens (0 entries disables it)
+TOKEN_CACHE_MAX_ENTRIES = DBConfig.security.get("token_cache_max_entries", default=50_000, cast=int)
+TOKEN_CACHE_MAX_BYTES = DBConfig.security.get("token_cache_max_bytes", default=16 << 20, cast=int)
+# Worker processes for password hashing (0 hashes inline, blocking the event loop)
+HASH_WORKERS = DBConfig.security.get("hash_workers", default=2, cast=int)
+# Hashing jobs allowed to run or wait for a worker before new ones are refused
+HASH_MAX_PENDING = DBConfig.security.get("hash_max_pending", default=64, cast=int)
 
 
 def hash_password(password: str) -> str:
@@ -24,6 +44,75 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return argon2.verify(plain_password, hashed_password)
 
 
+class HashingOverloadedError(Exception):
+    """Raised when too many password hashing jobs are already waiting for a worker."""
+
+
+class PasswordHasher:
+    """
+    Description
+
+    Runs the argon2 hashing and verification in a process pool, so that the CPU bound work
+    does not block the event loop of the worker while a burst of logins is served.
+
+    Attributes
+
+    max_workers (int):
+        The number of worker processes. With 0 the work runs inline in the event loop.
+
+    max_pending (int):
+        The number of jobs that may run or wait for a worker. Further jobs are refused with
+        HashingOverloadedError instead of queueing without bound.
+
+    pending (int):
+        The number of jobs currently running or waiting.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Created lazily, spawned workers do not inherit the event loop or the DB connections
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            raise HashingOverloadedError("Too many password hashing jobs pending.")
+
+        self.pending += 1
+        try:
+            # Includes the wait for a free worker
+            with timed("hash"):
+                if self.max_workers == 0:
+                    return func(*args)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:  # noqa A003
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(max_workers=HASH_WORKERS, max_pending=HASH_MAX_PENDING)
+
+
 def create_access_token(data: dict) -> str:
     """
     Create JWT(Json Web Token) token
@@ -41,14 +130,58 @@ def create_access_token(data: dict) -> str:
     return token
 
 
-def decode_access_token(token: str) -> dict:
+def verify_access_token(token: str) -> dict:
     """
-    Decode a JWT token and return the payload.
+    Verify the signature of a JWT token, decode it and return the payload.
     Raises jwt.ExpiredSignatureError or jwt.InvalidTokenError if invalid.
     """
     payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     return payload
 
 
+# Size in bytes of the blake2b digest of a token that keys the token cache
+TOKEN_DIGEST_SIZE = 16
+
+
+def payload_size(payload: dict) -> int:
+    """Approximate memory footprint of a cached payload in bytes, including its digest key."""
+    size = sys.getsizeof(payload) + sys.getsizeof(b"") + TOKEN_DIGEST_SIZE
+    for key, value in payload.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+# Payloads of verified tokens keyed by the digest of the token, each entry expires with its token
+token_cache: TTLCache[bytes, dict] = TTLCache(
+    max_size=max(TOKEN_CACHE_MAX_ENTRIES, 1),
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    max_weight=TOKEN_CACHE_MAX_BYTES,
+    weigher=payload_size,
+)
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Decode a JWT token and return the payload.
+    Raises jwt.ExpiredSignatureError or jwt.InvalidTokenError if invalid.
+
+    Clients reuse the same token until it expires, so verified payloads are cached by the
+    digest of the token until their `exp` claim. Only valid tokens are cached, the signature
+    of a token that is not in the cache is always verified.
+    """
+    if TOKEN_CACHE_MAX_ENTRIES <= 0:
+        return verify_access_token(token)
+
+    digest = hashlib.blake2b(token.encode(), digest_size=TOKEN_DIGEST_SIZE).digest()
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = verify_access_token(token)
+        ttl = payload["exp"] - time.time() if "exp" in payload else token_cache.ttl
+        if ttl > 0:
+            token_cache.set(digest, payload, ttl=ttl)
+    # A copy, so callers can not alter the cached payload
+    return dict(payload)
+
+
 if __name__ == "__main__":
     issubclass(jwt.ExpiredSignatureError, jwt.PyJWTError)
@@ -0,0 +1,45 @@
+# src/reservations/tasks.py
+import asyncio
+import logging
+
+from configs import DBConfig
+from database.bookings import release_expired_holds
+from database.engine import SessionLocal
+from reservations.event_cache import event_cache
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL_SECONDS = DBConfig.bookings.get("sweep_interval_seconds", default=30, cast=float)
+SWEEP_BATCH_SIZE = DBConfig.bookings.get("sweep_batch_size", default=500, cast=int)
+
+
+async def sweep_expired_holds(
+    interval: float = SWEEP_INTERVAL_SECONDS, batch_size: int = SWEEP_BATCH_SIZE
+) -> None:
+    """
+    Background task that releases expired seat holds, so abandoned carts give their seats back
+    without admin action.
+
+    Each iteration drains the expired holds in batches of `batch_size` (one short transaction
+    per batch) and then sleeps for `interval` seconds. Errors are logged and the task keeps
+    running, it only stops when cancelled.
+    """
+    while True:
+        try:
+            while True:
+                async with SessionLocal() as session:
+                    # The seat counters of the events are invalidated after the commit, as
+                    # after a hold
+                    released = await release_expired_holds(
+                        session, batch_size, on_release=event_cache.invalidate_seats
+                    )
+                if released:
+                    logger.info("Released %d expired seat holds", released)
+                if released < batch_size:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to release expired seat holds")
+
+        await asyncio.sleep(interval)
@@ -0,0 +1,83 @@
+# src/reservations/timing.py
+import json
+import logging
+import random
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs import DBConfig, bool_
+from pyutils.timing import Timings, current_timings
+
+__all__ = ["ServerTimingMiddleware", "SAMPLE_RATE", "SEND_HEADER"]
+
+logger = logging.getLogger(__name__)
+
+# Share of the requests timed, the others only pay for a random draw
+SAMPLE_RATE = DBConfig.timing.get("sample_rate", default=0.01, cast=float)
+# Whether the timed requests get a Server-Timing header, besides the log line
+SEND_HEADER = DBConfig.timing.get("server_timing_header", default=True, cast=bool_)
+
+
+class ServerTimingMiddleware:
+    """
+    Description
+
+    Times a sample of the requests: the database time and statement count (recorded by the
+    cursor hooks of `pyutils.timing.time_statements`), the password hashing time and the
+    response serialization time, besides the total time in the app.
+
+    The breakdown is sent in a `Server-Timing` header, with what happened before the response
+    started (the database time of a streamed export is mostly after), and logged as one JSON
+    line by the `reservations.timing` logger once the response is complete.
+
+    Attributes
+
+    sample_rate (float):
+        Share of the requests timed, between 0 and 1.
+
+    send_header (bool):
+        Whether the timed responses get a Server-Timing header.
+    """
+
+    def __init__(
+        self, app: ASGIApp, sample_rate: float = SAMPLE_RATE, send_header: bool = SEND_HEADER
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.send_header = send_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        timings = Timings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.send_header:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    phases = timings.server_timing()
+                    value = f"app;dur={elapsed_ms:.2f}" + (f", {phases}" if phases else "")
+                    MutableHeaders(scope=message).append("Server-Timing", value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            current_timings.reset(token)
+            timings.add("total", time.perf_counter() - start)
+            line = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                **timings.as_dict(),
+            }
+            logger.info(json.dumps(line))
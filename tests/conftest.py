@@ -9,6 +9,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
 from configs import DBConfig, bool_
+from database.bookings import reserve_seats
 from database.engine import engine
 from database.schema import (
     AddressORM,
@@ -27,6 +28,7 @@ from models.schema import (
     PaymentModel,
     UserModel,
 )
+from reservations import query_budgets
 from reservations.main import app
 
 username = DBConfig.user.get("username")
@@ -54,7 +56,9 @@ def session():
 
 # ============== ASYNC ENGINE- Client ==================
 @pytest_asyncio.fixture
-async def client() -> AsyncGenerator[AsyncClient, None]:
+async def client(monkeypatch) -> AsyncGenerator[AsyncClient, None]:
+    # A request over the query budget of its endpoint fails the test
+    monkeypatch.setattr(query_budgets, "BUDGET_ACTION", "raise")
     transport = ASGITransport(app=app)
     client = AsyncClient(base_url="http://test", transport=transport)
     try:
@@ -365,6 +369,10 @@ def populated_db(
     session.add_all(admins_orm)
     session.add_all(users_orm)
     session.add_all(events_orm)
+    session.flush()
+    # Bookings reserve their seats through the same conditional UPDATE as the application
+    for booking in bookings_orm:
+        session.execute(reserve_seats(booking.event_id, booking.seats))
     session.add_all(bookings_orm)
     session.add_all(payments_orm)
     session.add_all(cancellations_orm)
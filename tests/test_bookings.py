@@ -0,0 +1,46 @@
+# tests/test_bookings.py
+import pytest
+import sqlalchemy as sa
+
+from database.bookings import book_seats, reserve_seats
+from database.schema import BookingORM, EventORM
+
+
+def available_seats(session, event_id: int) -> int:
+    return session.execute(
+        sa.select((EventORM.total_seats - EventORM.reserved_seats).label("available_seats")).where(
+            EventORM.id_ == event_id
+        )
+    ).scalar_one()
+
+
+def test_reserve_seats_refuses_overbooking(session, populated_db):
+    # Arrange
+    seats_before = available_seats(session, 1)
+
+    # Act
+    result = session.execute(reserve_seats(1, seats_before + 1))
+
+    # Assert
+    assert result.rowcount == 0
+    assert available_seats(session, 1) == seats_before
+
+
+def test_reserve_seats_increments_reserved_seats(session, populated_db):
+    # Arrange
+    seats_before = available_seats(session, 2)
+
+    # Act
+    result = session.execute(reserve_seats(2, seats_before))
+
+    # Assert
+    assert result.rowcount == 1
+    assert available_seats(session, 2) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seats", [0, -1])
+async def test_book_seats_requires_positive_seats(seats):
+    booking = BookingORM(event_id=1, seats=seats)
+    with pytest.raises(ValueError, match="at least one seat"):
+        await book_seats(session=None, booking=booking)  # type: ignore[arg-type]
@@ -0,0 +1,90 @@
+# tests/test_cache.py
+from datetime import date
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.schema import UserORM
+from pyutils import TTLCache
+from reservations.dependencies import restore_principal, snapshot_principal
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    clock.now = 6
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes the least recently used entry
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_restore_principal_attaches_without_query():
+    user = UserORM(
+        id_=7,
+        first_name="Maria",
+        last_name="Papadopoulou",
+        password="hashed",
+        date_of_birth=date(1992, 5, 17),
+        email="maria@example.com",
+        phone="6901234567",
+    )
+    snapshot = snapshot_principal(user)
+
+    # The session has no bind, any query would fail
+    session = AsyncSession()
+    restored = await restore_principal(session, UserORM, snapshot)
+
+    state = inspect(restored)
+    assert state.persistent
+    assert state.identity == (7,)
+    assert not session.dirty
+    assert restored.email == "maria@example.com"
+    await session.close()
+
+
+def test_ttl_cache_evicts_over_max_weight():
+    cache = TTLCache(max_size=10, ttl=60, max_weight=10, weigher=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    cache.set("c", "xxxx")  # 12 > 10, "a" is evicted
+
+    assert "a" not in cache
+    assert cache.weight == 8
+    cache.set("b", "x")  # replacing an entry replaces its weight
+    assert cache.weight == 5
@@ -0,0 +1,58 @@
+# tests/test_conditional.py
+import pytest
+from fastapi import Request
+
+from reservations.conditional import if_none_match, make_etag
+from reservations.routers import events
+
+
+def request_with(if_none_match_header: str) -> Request:
+    headers = [(b"if-none-match", if_none_match_header.encode())] if if_none_match_header else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_etag_depends_on_every_part():
+    etag = make_etag(1, "2025-08-15T08:00:00", 15)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(1, "2025-08-15T08:00:00", 15)
+    assert etag != make_etag(1, "2025-08-15T08:00:00", 16)
+    assert etag != make_etag(2, "2025-08-15T08:00:00", 15)
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        ("", False),
+        ('"other"', False),
+        ("{etag}", True),
+        ("W/{etag}", True),
+        ('"other", {etag}', True),
+        ("*", True),
+    ],
+)
+def test_if_none_match(header, matches):
+    etag = make_etag(1, "2025-08-15T08:00:00", 15)
+    assert if_none_match(request_with(header.format(etag=etag)), etag) is matches
+
+
+@pytest.mark.asyncio
+async def test_not_modified_event_is_not_serialized(monkeypatch):
+    etag = make_etag(1, "2025-08-15T08:00:00", 15)
+    renders = []
+
+    async def read_event(_name, _primary):
+        return etag, {"id_": 1}
+
+    async def render_event(event):
+        renders.append(event)
+        return b"{}"
+
+    monkeypatch.setattr(events, "read_event", read_event)
+    monkeypatch.setattr(events, "render_event", render_event)
+
+    response = await events.get_event_by_name("Beach Getaway", request_with(etag))
+    assert response.status_code == 304 and renders == []
+
+    response = await events.get_event_by_name("Beach Getaway", request_with(""))
+    assert response.status_code == 200 and response.body == b"{}"
+    assert response.headers["etag"] == etag and len(renders) == 1
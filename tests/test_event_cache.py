@@ -0,0 +1,137 @@
+# tests/test_event_cache.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from database.bookings import reserve_seats
+from database.engine import SessionLocal, engine
+from database.schema import EventORM
+from models.schema import EventModel
+from reservations.event_cache import EventCache
+
+
+@pytest_asyncio.fixture
+async def cached_events(events):
+    names = [f"Cached {event['name']}" for event in events[:2]]
+    async with SessionLocal() as session:
+        for event, name in zip(events, names):
+            session.add(EventORM.from_attributes(EventModel(**{**event, "name": name})))
+        await session.commit()
+    try:
+        yield names
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(EventORM).where(EventORM.name.in_(names)))
+            await session.commit()
+        await engine.dispose()
+
+
+async def reserve(event_id: int, seats: int, cache: EventCache) -> None:
+    async with SessionLocal() as session:
+        await session.execute(reserve_seats(event_id, seats))
+        await session.commit()
+    cache.invalidate_seats(event_id)
+
+
+async def reserved_seats_in_db(name: str) -> int:
+    async with SessionLocal() as session:
+        return await session.scalar(select(EventORM.reserved_seats).filter_by(name=name))
+
+
+@pytest.mark.asyncio
+async def test_seat_counters_are_served_until_invalidated(cached_events):
+    cache = EventCache(max_size=10, ttl=60, seats_ttl=60)
+    name = cached_events[0]
+    async with SessionLocal() as session:
+        event = await cache.get(session, name)
+        assert await cache.get(session, "No such event") is None
+
+    # Written without invalidation, the cache keeps serving the old counters
+    async with SessionLocal() as session:
+        await session.execute(reserve_seats(event["id_"], 1))
+        await session.commit()
+    async with SessionLocal() as session:
+        assert (await cache.get(session, name))["reserved_seats"] == event["reserved_seats"]
+
+    await reserve(event["id_"], 1, cache)
+    async with SessionLocal() as session:
+        cached = await cache.get(session, name)
+    assert cached["reserved_seats"] == event["reserved_seats"] + 2
+    assert cached["available_seats"] == event["available_seats"] - 2
+    # Only the counters were reloaded
+    assert cache.stats()["metadata"]["misses"] == 2
+    assert cache.stats()["metadata"]["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_size_limit_evicts_least_recently_used(cached_events):
+    cache = EventCache(max_size=1, ttl=60, seats_ttl=60)
+    async with SessionLocal() as session:
+        for name in cached_events:
+            await cache.get(session, name)
+    stats = cache.stats()["metadata"]
+    assert stats["size"] == 1
+    assert stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_consistent_under_concurrent_writes(cached_events):
+    cache = EventCache(max_size=10, ttl=60, seats_ttl=60)
+    name = cached_events[0]
+    async with SessionLocal() as session:
+        event = await cache.get(session, name)
+    writes = min(10, event["available_seats"])
+    writing = True
+
+    async def read_continuously():
+        while writing:
+            async with SessionLocal() as session:
+                await cache.get(session, name)
+
+    async def write_all():
+        nonlocal writing
+        try:
+            await asyncio.gather(*(reserve(event["id_"], 1, cache) for _ in range(writes)))
+        finally:
+            writing = False
+
+    await asyncio.gather(write_all(), *(read_continuously() for _ in range(4)))
+
+    async with SessionLocal() as session:
+        cached = await cache.get(session, name)
+    assert cached["reserved_seats"] == await reserved_seats_in_db(name)
+    assert cached["reserved_seats"] == event["reserved_seats"] + writes
+
+
+class ProbeSession:
+    """Answers the seat probe of `EventCache.get`, running `during` while it is in flight."""
+
+    def __init__(self, seats: dict, during=lambda: None):
+        self.seats = seats
+        self.during = during
+
+    async def execute(self, _statement, _params):
+        self.during()
+        return SimpleNamespace(one_or_none=lambda: SimpleNamespace(_mapping=self.seats))
+
+
+@pytest.mark.asyncio
+async def test_seat_generations_are_bounded():
+    cache = EventCache(max_size=2, ttl=60, seats_ttl=60)
+    cache.metadata.set("Probed", {"id_": 1, "name": "Probed"})
+    seats = {"reserved_seats": 1, "available_seats": 9, "updated_at": None}
+
+    def invalidate_many():
+        for event_id in range(1, 100):
+            cache.invalidate_seats(event_id)
+
+    # The invalidation of the probed event is forgotten, the probe still does not store
+    assert (await cache.get(ProbeSession(seats, invalidate_many), "Probed"))["available_seats"] == 9
+    assert len(cache._seats_invalidations) == 2
+    assert cache.seats.get(1) is None
+
+    await cache.get(ProbeSession(seats), "Probed")
+    assert cache.seats.get(1) == seats
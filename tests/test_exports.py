@@ -0,0 +1,112 @@
+# tests/test_exports.py
+import csv
+import io
+import json
+import tracemalloc
+from datetime import date
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from database.schema import UserORM
+from models.responses import UserResponse
+from reservations.exports import export_columns, stream_export
+from src.enumerations import ExportFormat
+
+# The streaming is database agnostic, an in-memory SQLite database stands in for MySQL
+pytest.importorskip("aiosqlite")
+
+
+async def users_engine(count: int):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(UserORM.__table__.create)
+        await conn.execute(
+            insert(UserORM),
+            [
+                {
+                    "first_name": "Maria",
+                    "last_name": f"Papadopoulou {i}",
+                    "password": "x" * 96,
+                    "date_of_birth": date(1992, 5, 17),
+                    "email": f"user{i}@example.com",
+                    "phone": "6901234567",
+                }
+                for i in range(count)
+            ],
+        )
+    return engine
+
+
+async def export(engine, export_format: ExportFormat, chunk_size: int) -> list[bytes]:
+    async with AsyncSession(engine) as session:
+        stmt = select(UserORM).order_by(UserORM.id_)
+        return [
+            chunk
+            async for chunk in stream_export(
+                session, stmt, UserResponse, export_format, chunk_size=chunk_size
+            )
+        ]
+
+
+async def drain(engine, chunk_size: int) -> None:
+    async with AsyncSession(engine) as session:
+        stmt = select(UserORM).order_by(UserORM.id_)
+        async for _chunk in stream_export(
+            session, stmt, UserResponse, ExportFormat.NDJSON, chunk_size=chunk_size
+        ):
+            pass
+
+
+async def peak_memory(count: int, chunk_size: int) -> int:
+    """Peak of the memory allocated while exporting `count` users, the chunks are discarded."""
+    engine = await users_engine(count)
+    try:
+        tracemalloc.start()
+        await drain(engine, chunk_size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_has_one_line_per_row():
+    engine = await users_engine(25)
+    try:
+        chunks = await export(engine, ExportFormat.NDJSON, chunk_size=10)
+    finally:
+        await engine.dispose()
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["email"] for line in lines] == [
+        f"user{i}@example.com" for i in range(25)
+    ]
+    assert "password" not in json.loads(lines[0])
+
+
+@pytest.mark.asyncio
+async def test_csv_export_starts_with_a_header():
+    engine = await users_engine(5)
+    try:
+        chunks = await export(engine, ExportFormat.CSV, chunk_size=10)
+    finally:
+        await engine.dispose()
+
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == export_columns(UserResponse)
+    assert len(rows) == 6
+    assert rows[1][rows[0].index("date_of_birth")] == "1992-05-17"
+
+
+@pytest.mark.asyncio
+async def test_export_memory_does_not_grow_with_the_table():
+    await peak_memory(100, chunk_size=100)  # import and compile everything beforehand
+    small = await peak_memory(1_000, chunk_size=100)
+    large = await peak_memory(10_000, chunk_size=100)
+    # Ten times the rows, one chunk of rows held at a time: the peak only grows by the string
+    # cache of pydantic-core (16k strings at most, about 1MB). Loading the 10k rows in a list
+    # as `paginate` does peaks at more than 30MB.
+    assert large - small < 2 * 1024 * 1024
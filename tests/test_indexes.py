@@ -0,0 +1,27 @@
+# tests/test_indexes.py
+import pytest
+
+from database.indexes import check_indexes, declared_indexes
+from database.schema import bookings_name, cancellations_name, events_name
+
+
+@pytest.mark.parametrize(
+    "table, columns",
+    [
+        (bookings_name, ("event_id", "status")),
+        (bookings_name, ("user_id",)),
+        (cancellations_name, ("user_id",)),
+        (events_name, ("status", "event_start_date")),
+    ],
+)
+def test_foreign_keys_and_filters_are_indexed(table, columns):
+    # A composite index serves every prefix of its columns
+    assert any(
+        spec.table == table and spec.columns[: len(columns)] == columns
+        for spec in declared_indexes().values()
+    )
+
+
+def test_declared_indexes_exist(session):
+    report = check_indexes(session.connection())
+    assert report.missing == []
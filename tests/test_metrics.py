@@ -0,0 +1,79 @@
+# tests/test_metrics.py
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from pyutils.metrics import Registry
+from reservations.metrics import (
+    MetricsMiddleware,
+    request_duration,
+    request_errors_total,
+    requests_total,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ("/a",))
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_counters_and_callbacks_render_their_samples():
+    registry = Registry()
+    counter = registry.counter("hits_total", "Hits.", ("cache",))
+    counter.inc(("tokens",))
+    counter.inc(("tokens",), 2)
+    registry.callback("ratio", "Ratio.", lambda: [(('say "hi"',), 0.5)], ("cache",))
+
+    text = registry.render()
+    assert 'hits_total{cache="tokens"} 3\n' in text
+    assert 'ratio{cache="say \\"hi\\""} 0.5\n' in text
+    with pytest.raises(ValueError):
+        registry.counter("hits_total", "Again.")
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metered/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/metered-failure")
+    async def failure():
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    duration = request_duration.series(("GET", "/metered/{item_id}"))
+    before = sum(duration.counts)
+
+    transport = ASGITransport(app=make_app(), raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for item_id in (1, 2):
+            assert (await client.get(f"/metered/{item_id}")).status_code == 200
+        assert (await client.get("/metered/x")).status_code == 422
+        assert (await client.get("/metered-failure")).status_code == 500
+        assert (await client.get("/nowhere")).status_code == 404
+
+    assert requests_total.value(("GET", "/metered/{item_id}", "200")) >= 2
+    assert requests_total.value(("GET", "/metered/{item_id}", "422")) >= 1
+    assert sum(duration.counts) - before == 3
+    assert request_errors_total.value(("GET", "/metered-failure")) >= 1
+    assert request_errors_total.value(("GET", "/metered/{item_id}")) == 0
+    assert requests_total.value(("GET", "unmatched", "404")) >= 1
@@ -0,0 +1,21 @@
+# tests/test_pagination.py
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from reservations.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=UTC)
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "bm90IGpzb24", "WzFd"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
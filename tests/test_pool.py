@@ -0,0 +1,74 @@
+# tests/test_pool.py
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from database.pool import MeteredPoolMixin, ping_idle_connections, pool_stats
+
+
+class MeteredSyncQueuePool(MeteredPoolMixin, QueuePool):
+    pass
+
+
+@pytest.fixture
+def sqlite_engine():
+    eng = create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        poolclass=MeteredSyncQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield eng
+    eng.dispose()
+
+
+def test_pool_stats_report_occupancy_and_timeouts(sqlite_engine):
+    first = sqlite_engine.connect()
+    first.execute(text("SELECT 1"))
+    second = sqlite_engine.connect()
+    second.execute(text("SELECT 1"))
+
+    stats = pool_stats(sqlite_engine)
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 2
+
+    with pytest.raises(exc.TimeoutError):
+        sqlite_engine.connect().execute(text("SELECT 1"))
+
+    stats = pool_stats(sqlite_engine)
+    assert stats["checkout_timeouts"] == 1
+    assert stats["checkout_wait_seconds_max"] >= 0.05
+
+    first.close()
+    second.close()
+    assert pool_stats(sqlite_engine)["checked_out"] == 0
+
+
+def test_metrics_survive_dispose(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    sqlite_engine.dispose()
+    assert pool_stats(sqlite_engine)["checkouts"] == 1
+
+
+def test_idle_connections_failing_the_ping_are_replaced(sqlite_engine):
+    # sqlite3 connections have no ping(), so every idle connection fails the liveness check
+    ping_idle_connections(sqlite_engine, idle_seconds=0)
+    with sqlite_engine.connect() as conn:
+        first = conn.connection.dbapi_connection
+    with sqlite_engine.connect() as conn:
+        assert conn.connection.dbapi_connection is not first
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_recently_used_connections_are_not_pinged(sqlite_engine):
+    ping_idle_connections(sqlite_engine, idle_seconds=60)
+    with sqlite_engine.connect() as conn:
+        first = conn.connection.dbapi_connection
+    with sqlite_engine.connect() as conn:
+        assert conn.connection.dbapi_connection is first
@@ -0,0 +1,137 @@
+# tests/test_principals.py
+import pytest
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.queries import principal_by_email
+from database.schema import AdminORM, UserORM
+from reservations import dependencies, principals
+from reservations.dependencies import (
+    decode_token_payload,
+    get_current_principal,
+    get_current_user,
+)
+from reservations.principals import (
+    Principal,
+    TokenVersions,
+    principal_from_claims,
+    token_claims,
+)
+from reservations.security import create_access_token
+from src.enumerations import Role
+
+
+@pytest.fixture
+def stateless_tokens(monkeypatch):
+    monkeypatch.setattr(principals, "STATELESS_TOKENS", True)
+    versions = TokenVersions()
+    monkeypatch.setattr(principals, "token_versions", versions)
+    monkeypatch.setattr(dependencies, "token_versions", versions)
+
+
+@pytest.fixture
+def no_lookups(monkeypatch):
+    """Fail any database lookup of a principal, the stateless path must not need one."""
+
+    def reading(*_args, **_kwargs):
+        raise AssertionError("unexpected database read")
+
+    class NoFlight:
+        async def do(self, key, _fn):
+            raise AssertionError(f"unexpected principal lookup: {key}")
+
+    monkeypatch.setattr(dependencies, "reading", reading)
+    monkeypatch.setattr(dependencies, "principal_lookups", NoFlight())
+
+
+def make_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+@pytest.fixture
+def user_orm():
+    return UserORM(id_=3, email="maria@example.com", token_version=2)
+
+
+def test_token_claims_only_carry_subject_by_default(user_orm):
+    assert token_claims(user_orm, Role.USER) == {"sub": "maria@example.com"}
+    assert principal_from_claims({"sub": "maria@example.com"}) is None
+
+
+def test_stateless_token_claims_round_trip(stateless_tokens, user_orm):
+    claims = token_claims(user_orm, Role.USER)
+    assert claims == {"sub": "maria@example.com", "uid": 3, "role": "user", "ver": 2}
+    assert principal_from_claims(claims) == Principal(
+        id_=3, email="maria@example.com", role=Role.USER, token_version=2
+    )
+
+
+def test_stateless_admin_login_round_trip(stateless_tokens):
+    # The row /login resolves an admin email to, through the user/admin UNION
+    engine = create_engine("sqlite://")
+    for table in (UserORM.__table__, AdminORM.__table__):
+        table.create(engine)
+    try:
+        with Session(engine) as session:
+            session.add(
+                AdminORM(id_=1, first_name="A", last_name="B", email="a@x.com", password="h")
+            )
+            session.commit()
+            [row] = session.execute(principal_by_email("a@x.com")).all()
+    finally:
+        engine.dispose()
+
+    claims = token_claims(row, Role.ADMIN)
+    assert claims == {"sub": "a@x.com", "uid": 1, "role": "admin", "ver": 0}
+    payload = decode_token_payload(create_access_token(claims))
+    assert principal_from_claims(payload) == Principal(id_=1, email="a@x.com", role=Role.ADMIN)
+
+
+def test_token_versions_revoke_older_versions():
+    versions = TokenVersions()
+    principal = Principal(id_=3, email="maria@example.com", role=Role.USER, token_version=1)
+    assert not versions.is_revoked(principal)
+
+    versions.observe(Role.USER, 3, 2)
+    versions.observe(Role.USER, 3, 1)  # an older observation does not lower the latest version
+    assert versions.is_revoked(principal)
+
+
+def test_token_versions_revoke_admins_separately():
+    versions = TokenVersions()
+    user = Principal(id_=1, email="maria@example.com", role=Role.USER)
+    admin = Principal(id_=1, email="admin@example.com", role=Role.ADMIN)
+
+    versions.observe(Role.ADMIN, 1, 1)
+    assert versions.is_revoked(admin)
+    assert not versions.is_revoked(user)
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_without_query(stateless_tokens, no_lookups):
+    admin = AdminORM(id_=1, email="admin@example.com")
+    token = create_access_token(token_claims(admin, Role.ADMIN))
+
+    principal = await get_current_principal(make_request(), token=token)
+    assert principal == Principal(id_=1, email="admin@example.com", role=Role.ADMIN)
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_rejects_revoked_token(stateless_tokens, no_lookups, user_orm):
+    token = create_access_token(token_claims(user_orm, Role.USER))
+    principals.token_versions.observe(Role.USER, user_orm.id_, user_orm.token_version + 1)
+
+    with pytest.raises(HTTPException) as ex:
+        await get_current_principal(make_request(), token=token)
+    assert ex.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_admin_token(stateless_tokens):
+    admin = AdminORM(id_=1, email="admin@example.com")
+    token = create_access_token(token_claims(admin, Role.ADMIN))
+
+    with pytest.raises(HTTPException) as ex:
+        await get_current_user(token=token, session=None)
+    assert ex.value.status_code == 401
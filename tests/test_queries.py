@@ -0,0 +1,91 @@
+# tests/test_queries.py
+from datetime import date
+
+import pytest
+from sqlalchemy import Select, select, text, update
+
+from database.queries import (
+    ADMIN_BY_EMAIL,
+    EVENT_BY_NAME,
+    USER_BY_EMAIL,
+    principal_by_email,
+    search_events,
+)
+from database.schema import EventORM, events_name
+from src.enumerations import EventStatus
+
+
+def explain(session, stmt: Select) -> dict:
+    sql = stmt.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+    return session.execute(text(f"EXPLAIN {sql}")).mappings().one()
+
+
+def test_principal_by_email_resolves_users_and_admins(session, populated_db, users, admins):
+    user_rows = session.execute(principal_by_email(users[0]["email"])).all()
+    assert [(row.role, row.email) for row in user_rows] == [("user", users[0]["email"])]
+    assert user_rows[0].phone == users[0]["phone"]
+
+    admin_rows = session.execute(principal_by_email(admins[0]["email"])).all()
+    assert [(row.role, row.email) for row in admin_rows] == [("admin", admins[0]["email"])]
+    assert admin_rows[0].phone is None
+
+    assert session.execute(principal_by_email("nobody@example.com")).all() == []
+
+
+def test_available_seats_follows_reserved_seats(session, populated_db, events):
+    event_id = session.scalar(select(EventORM.id_).filter_by(name=events[0]["name"]))
+    session.execute(update(EventORM).filter_by(id_=event_id).values(reserved_seats=0))
+    total_seats, available_seats = session.execute(
+        select(EventORM.total_seats, EventORM.available_seats).filter_by(id_=event_id)
+    ).one()
+    assert available_seats == total_seats
+
+
+@pytest.mark.parametrize(
+    "criteria, index",
+    [
+        (
+            {"destination": "Santorini", "date_from": date(2025, 1, 1), "min_available_seats": 2},
+            f"ix_{events_name}_search_destination",
+        ),
+        ({"start_location": "Athens"}, f"ix_{events_name}_search_start_location"),
+        (
+            {"date_from": date(2025, 1, 1), "date_to": date(2025, 12, 31)},
+            f"ix_{events_name}_search_start_date",
+        ),
+    ],
+)
+def test_search_events_uses_search_indexes(session, populated_db, criteria, index):
+    plan = explain(session, search_events(**criteria))
+    assert plan["key"] == index
+    assert plan["type"] in ("ref", "range")
+
+
+def test_search_events_filters(session, populated_db, events):
+    event = events[0]
+    found = session.scalars(
+        search_events(
+            destination=event["destination"],
+            start_location=event["start_location"],
+            date_from=event["event_start_date"],
+            date_to=event["event_end_date"],
+        )
+    ).all()
+    assert event["name"] in [event_orm.name for event_orm in found]
+    assert all(event_orm.status == EventStatus.ACTIVE for event_orm in found)
+
+    too_many_seats = event["total_seats"] + 1
+    found = session.scalars(
+        search_events(destination=event["destination"], min_available_seats=too_many_seats)
+    ).all()
+    assert found == []
+
+
+def test_hot_lookups(session, populated_db, users, admins, events):
+    user = session.execute(USER_BY_EMAIL, {"email": users[0]["email"]}).scalar_one()
+    assert user.phone == users[0]["phone"]
+    admin = session.execute(ADMIN_BY_EMAIL, {"email": admins[0]["email"]}).scalar_one()
+    assert admin.first_name == admins[0]["first_name"]
+    event = session.execute(EVENT_BY_NAME, {"name": events[0]["name"]}).scalar_one()
+    assert event.destination == events[0]["destination"]
+    assert session.execute(USER_BY_EMAIL, {"email": "nobody@example.com"}).first() is None
@@ -0,0 +1,168 @@
+# tests/test_query_budget.py
+import logging
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import ForeignKey, create_engine, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    mapped_column,
+    relationship,
+    selectinload,
+)
+
+from pyutils.queries import (
+    QueryBudgetExceeded,
+    count_queries,
+    count_statements,
+    fingerprint,
+    query_budget,
+)
+from reservations import query_budgets
+from reservations.query_budgets import QueryBudgetMiddleware
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Parent(Base):
+    __tablename__ = "parents"
+    id_: Mapped[int] = mapped_column(primary_key=True)
+    children: Mapped[list["Child"]] = relationship(back_populates="parent", lazy="select")
+
+
+class Child(Base):
+    __tablename__ = "children"
+    id_: Mapped[int] = mapped_column(primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("parents.id_"))
+    parent: Mapped[Parent] = relationship(back_populates="children", lazy="select")
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    count_statements(engine)
+    with Session(engine) as session:
+        session.add_all([Parent(id_=i, children=[Child(), Child()]) for i in range(5)])
+        session.commit()
+        session.expunge_all()
+        yield session
+    engine.dispose()
+
+
+def test_fingerprint_ignores_the_values():
+    assert fingerprint("SELECT * FROM t WHERE a = 1 AND b = 'x'") == fingerprint(
+        "SELECT *\n  FROM t WHERE a = %s AND b = %s"
+    )
+    assert (
+        fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (?+)"
+    )
+
+
+def test_lazy_loads_are_reported_as_n_plus_one(session):
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        with count_queries() as log:
+            for parent in session.scalars(select(Parent)):
+                assert len(parent.children) == 2
+    assert log.total == 6
+
+
+def test_eager_loading_stays_within_budget(session):
+    with count_queries(budget=2) as log:
+        parents = session.scalars(select(Parent).options(selectinload(Parent.children))).all()
+        assert sum(len(parent.children) for parent in parents) == 10
+    assert log.total == 2
+
+
+def test_budget_counts_every_statement(session):
+    with pytest.raises(QueryBudgetExceeded, match="3 statements for a budget of 2"):
+        with count_queries(budget=2):
+            for table in ("parents", "children", "parents"):
+                session.execute(text(f"SELECT count(*) FROM {table}"))
+
+
+@pytest_asyncio.fixture
+async def engine():
+    pytest.importorskip("aiosqlite")
+    eng = create_async_engine("sqlite+aiosqlite://")
+    count_statements(eng.sync_engine)
+    try:
+        yield eng
+    finally:
+        await eng.dispose()
+
+
+def make_app(engine, action: Optional[str]) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, action=action, repeat_limit=3)
+
+    @app.get("/statements/{count}")
+    @query_budget(2)
+    async def statements(count: int):
+        async with engine.connect() as conn:
+            for i in range(count):
+                await conn.execute(text(f"SELECT {i} + :n"), {"n": i})
+        return {"count": count}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_requests_over_budget_fail_with_the_raise_action(engine):
+    transport = ASGITransport(app=make_app(engine, "raise"))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/statements/2")).status_code == 200
+        with pytest.raises(QueryBudgetExceeded, match="GET /statements/3: 3 statements"):
+            await client.get("/statements/3")
+
+
+@pytest.mark.asyncio
+async def test_middleware_follows_the_configured_action(engine, monkeypatch):
+    monkeypatch.setattr(query_budgets, "BUDGET_ACTION", "raise")
+    transport = ASGITransport(app=make_app(engine, None))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(QueryBudgetExceeded):
+            await client.get("/statements/3")
+
+
+@pytest.mark.asyncio
+async def test_requests_record_into_the_enclosing_count(engine):
+    transport = ASGITransport(app=make_app(engine, "raise"))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with count_queries() as log:
+            assert (await client.get("/statements/2")).status_code == 200
+    assert log.total == 2
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.mark.asyncio
+async def test_requests_over_budget_are_logged_with_the_warn_action(engine):
+    handler = Records()
+    logger = logging.getLogger("reservations.query_budgets")
+    logger.addHandler(handler)
+    try:
+        transport = ASGITransport(app=make_app(engine, "warn"))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/statements/4")).status_code == 200
+    finally:
+        logger.removeHandler(handler)
+
+    [message] = handler.messages
+    assert "4 statements for a budget of 2" in message
+    assert "4 executions of the same statement" in message
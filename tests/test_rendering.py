@@ -0,0 +1,63 @@
+# tests/test_rendering.py
+from decimal import Decimal
+
+import pytest
+from fastapi import Depends, FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from models.responses import BookingResponse, Page
+from reservations.rendering import ModelResponse
+from src.enumerations import BookingStatus
+
+BOOKING = BookingResponse(
+    id=7, event_id=3, unit_price=Decimal("120.00"), seats=2, status=BookingStatus.PENDING
+)
+
+
+def set_cookie(response: Response) -> None:
+    response.set_cookie("read_primary_until", "1")
+
+
+app = FastAPI()
+
+
+@app.get("/default", response_model=Page[BookingResponse])
+async def default() -> Page[BookingResponse]:
+    return Page[BookingResponse](items=[BOOKING], next_cursor="abc")
+
+
+@app.get("/fast")
+async def fast() -> ModelResponse:
+    return ModelResponse(Page[BookingResponse](items=[BOOKING], next_cursor="abc"))
+
+
+@app.get("/list")
+async def listed() -> ModelResponse:
+    return ModelResponse([BOOKING, BOOKING])
+
+
+@app.post("/created", dependencies=[Depends(set_cookie)])
+async def created(response: Response) -> ModelResponse:
+    return ModelResponse(BOOKING, status_code=201, response=response)
+
+
+@pytest.mark.asyncio
+async def test_model_response_matches_the_default_serialization():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        default_response = await client.get("/default")
+        fast_response = await client.get("/fast")
+        listed_response = await client.get("/list")
+
+    assert fast_response.content == default_response.content
+    assert fast_response.headers["content-type"] == "application/json"
+    assert listed_response.json() == [default_response.json()["items"][0]] * 2
+
+
+@pytest.mark.asyncio
+async def test_model_response_keeps_the_headers_of_the_response_parameter():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/created")
+
+    assert response.status_code == 201
+    assert response.json()["id"] == 7
+    assert response.cookies["read_primary_until"] == "1"
@@ -1,7 +1,20 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
 from urllib.parse import quote
 
 import pytest
 import pytest_asyncio
+from sqlalchemy import select
+
+from database.bookings import hold_seats, release_expired_holds
+from database.engine import SessionLocal
+from database.schema import BookingORM, EventORM
+from pyutils.queries import QueryLog, count_queries
+from reservations import dependencies, principals
+from reservations.event_cache import event_cache
+from reservations.principals import TokenVersions
+from src.enumerations import BookingStatus
 
 
 @pytest.fixture(scope="function")
@@ -59,6 +72,11 @@ def event_one(events):
     return events[0]
 
 
+def statement_kinds(log: QueryLog) -> list[str]:
+    """The first keyword of every statement counted in `log`, e.g. INSERT."""
+    return [shape.split()[0] for shape, count in log.counts.items() for _ in range(count)]
+
+
 @pytest.mark.asyncio
 async def test_healthcheck(client):
     response = await client.get("/")
@@ -122,3 +140,309 @@ async def test_insert_get_delete_event(client, admin_token, event_one):
         headers={"Authorization": f"Bearer {admin_token}"},
     )
     assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_hold_and_confirm_booking(client, admin_token, user_one, event_one):
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    event_name_encoded = quote(event_one["name"])
+    response = await client.post("/events/register", headers=admin_headers, json=event_one)
+    assert response.status_code == 201
+    response = await client.post("users/register", json=user_one)
+    user_headers = {"Authorization": f"Bearer {response.json()["access_token"]}"}
+
+    # Hold
+    response = await client.post(
+        "/bookings/hold", headers=user_headers, json={"event_name": event_one["name"], "seats": 2}
+    )
+    assert response.status_code == 201
+    booking = response.json()
+    assert booking["status"] == "pending"
+    assert booking["expires_at"] is not None
+
+    # Overbooking is refused
+    response = await client.post(
+        "/bookings/hold",
+        headers=user_headers,
+        json={"event_name": event_one["name"], "seats": event_one["total_seats"]},
+    )
+    assert response.status_code == 409
+
+    # Confirm
+    response = await client.post(f"/bookings/{booking["id"]}/confirm", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "active"
+    assert response.json()["expires_at"] is None
+
+    # A confirmed hold can not be confirmed again
+    response = await client.post(f"/bookings/{booking["id"]}/confirm", headers=user_headers)
+    assert response.status_code == 410
+
+    response = await client.get(f"/events?event_name={event_name_encoded}")
+    assert response.json()["reserved_seats"] == event_one["reserved_seats"] + 2
+
+    await client.delete(f"/events/delete?event_name={event_name_encoded}", headers=admin_headers)
+    await client.delete("/users/delete_me", headers=user_headers)
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_tokens_are_revoked(
+    client, admin_token, user_one, event_one, monkeypatch
+):
+    monkeypatch.setattr(principals, "STATELESS_TOKENS", True)
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.post("/events/register", headers=admin_headers, json=event_one)
+    assert response.status_code == 201
+    response = await client.post("/users/register", json=user_one)
+    user_headers = {"Authorization": "Bearer " + response.json()["access_token"]}
+    hold = {"event_name": event_one["name"], "seats": 1}
+
+    try:
+        assert (await client.delete("/users/delete_me", headers=user_headers)).status_code == 204
+        response = await client.post("/bookings/hold", headers=user_headers, json=hold)
+        assert response.status_code == 401
+
+        # A worker that did not see the deletion lets the token through, the hold is refused
+        # when its booking references the missing user
+        monkeypatch.setattr(dependencies, "token_versions", TokenVersions())
+        response = await client.post("/bookings/hold", headers=user_headers, json=hold)
+        assert response.status_code == 401
+    finally:
+        await client.delete(
+            "/events/delete", params={"event_name": event_one["name"]}, headers=admin_headers
+        )
+
+
+@pytest.mark.asyncio
+async def test_expired_holds_are_released(client, admin_token, event_one):
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    event_name_encoded = quote(event_one["name"])
+    response = await client.post("/events/register", headers=admin_headers, json=event_one)
+    assert response.status_code == 201
+
+    async with SessionLocal() as session:
+        event_id = await session.scalar(select(EventORM.id_).filter_by(name=event_one["name"]))
+        booking = BookingORM(event_id=event_id, unit_price=Decimal("120.00"), seats=3)
+        await hold_seats(session, booking, ttl=timedelta(seconds=-1))
+        await session.commit()
+
+    async with SessionLocal() as session:
+        released = await release_expired_holds(
+            session, batch_size=100, on_release=event_cache.invalidate_seats
+        )
+        assert released >= 1
+
+    async with SessionLocal() as session:
+        booking = await session.get(BookingORM, booking.id_)
+        assert booking.status == BookingStatus.CANCELLED
+
+    response = await client.get(f"/events?event_name={event_name_encoded}")
+    assert response.json()["reserved_seats"] == event_one["reserved_seats"]
+
+    await client.delete(f"/events/delete?event_name={event_name_encoded}", headers=admin_headers)
+
+
+@pytest.mark.asyncio
+async def test_events_are_listed_page_by_page(client, admin_token, event_one):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    names = [f"{event_one['name']} {i}" for i in range(3)]
+    for name in names:
+        response = await client.post(
+            "/events/register", headers=headers, json={**event_one, "name": name}
+        )
+        assert response.status_code == 201
+
+    try:
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            response = await client.get("/events/", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 2
+            seen.extend(event["name"] for event in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen))
+        assert set(names) <= set(seen)
+    finally:
+        for name in names:
+            await client.delete("/events/delete", params={"event_name": name}, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_listing_rejects_invalid_cursor_and_page_size(client):
+    assert (await client.get("/events/", params={"cursor": "garbage"})).status_code == 400
+    assert (await client.get("/events/", params={"limit": 0})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bookings_listing_requires_admin(client):
+    response = await client.get("/bookings/")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_events_are_exported_as_ndjson_and_csv(client, admin_token, event_one):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    assert (await client.get("/exports/events")).status_code == 401
+    response = await client.post("/events/register", headers=headers, json=event_one)
+    assert response.status_code == 201
+
+    try:
+        response = await client.get("/exports/events", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        names = [json.loads(line)["name"] for line in response.text.splitlines()]
+        assert event_one["name"] in names
+
+        response = await client.get("/exports/events", params={"format": "csv"}, headers=headers)
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0].startswith("name,description,")
+        assert len(lines) == len(names) + 1
+    finally:
+        await client.delete(
+            "/events/delete", params={"event_name": event_one["name"]}, headers=headers
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_events(client, admin_token, event_one):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.post("/events/register", headers=headers, json=event_one)
+    assert response.status_code == 201
+
+    try:
+        params = {
+            "destination": event_one["destination"],
+            "date_from": event_one["event_start_date"],
+            "min_available_seats": 1,
+        }
+        response = await client.get("/events/search", params=params)
+        assert response.status_code == 200
+        found = {event["name"]: event for event in response.json()}
+        assert found[event_one["name"]]["available_seats"] == (
+            event_one["total_seats"] - event_one["reserved_seats"]
+        )
+
+        params["min_available_seats"] = event_one["total_seats"] + 1
+        response = await client.get("/events/search", params=params)
+        assert event_one["name"] not in [event["name"] for event in response.json()]
+
+        params = {"date_from": "2025-08-17", "date_to": "2025-08-15"}
+        assert (await client.get("/events/search", params=params)).status_code == 422
+    finally:
+        await client.delete(
+            "/events/delete", params={"event_name": event_one["name"]}, headers=headers
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_events_batch(client, admin_token, event_one):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    names = [f"{event_one['name']} {i}" for i in range(2)]
+    for name in names:
+        response = await client.post(
+            "/events/register", headers=headers, json={**event_one, "name": name}
+        )
+        assert response.status_code == 201
+
+    try:
+        with count_queries() as log:
+            response = await client.post(
+                "/events/batch", json={"names": [names[1], "No such event", names[0]]}
+            )
+        assert response.status_code == 200
+        assert statement_kinds(log) == ["SELECT"]
+        results = response.json()
+        assert [result["key"] for result in results] == [names[1], "No such event", names[0]]
+        assert [result["found"] for result in results] == [True, False, True]
+        assert results[1]["event"] is None
+        assert results[0]["event"]["name"] == names[1]
+
+        async with SessionLocal() as session:
+            result = await session.execute(select(EventORM.id_).where(EventORM.name.in_(names)))
+            ids = sorted(result.scalars())
+        response = await client.post("/events/batch", json={"ids": [ids[1], -1, ids[0]]})
+        assert [result["found"] for result in response.json()] == [True, False, True]
+
+        assert (await client.post("/events/batch", json={})).status_code == 422
+        response = await client.post("/events/batch", json={"names": names, "ids": ids})
+        assert response.status_code == 422
+        response = await client.post("/events/batch", json={"ids": list(range(201))})
+        assert response.status_code == 422
+    finally:
+        for name in names:
+            await client.delete("/events/delete", params={"event_name": name}, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_register_round_trips(client, admin_token, user_one, event_one):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    # INSERT user, INSERT address: no lookup of the email, no refresh
+    with count_queries() as log:
+        response = await client.post("/users/register", json=user_one)
+    assert response.status_code == 201
+    assert response.json()["user"]["created_at"] is not None
+    assert statement_kinds(log) == ["INSERT", "INSERT"]
+    access_token = response.json()["access_token"]
+
+    with count_queries() as log:
+        response = await client.post("/users/register", json=user_one)
+    assert response.status_code == 400
+    assert statement_kinds(log) == ["INSERT"]
+
+    # Resolves the admin once, later requests find it in the principal cache
+    await client.get("/bookings/", params={"limit": 1}, headers=headers)
+
+    with count_queries() as log:
+        response = await client.post("/events/register", headers=headers, json=event_one)
+    assert response.status_code == 201
+    assert response.json()["available_seats"] == (
+        event_one["total_seats"] - event_one["reserved_seats"]
+    )
+    assert statement_kinds(log) == ["INSERT"]
+
+    await client.delete(
+        "/events/delete", params={"event_name": event_one["name"]}, headers=headers
+    )
+    await client.delete("/users/delete_me", headers={"Authorization": f"Bearer {access_token}"})
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_event(client, admin_token, event_one, user_one):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.post("/events/register", headers=headers, json=event_one)
+    assert response.status_code == 201
+    params = {"event_name": event_one["name"]}
+
+    try:
+        response = await client.get("/events", params=params)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert "max-age" in response.headers["cache-control"]
+
+        response = await client.get("/events", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        # A booking changes the seat counter, hence the ETag
+        response = await client.post("/users/register", json=user_one)
+        user_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = await client.post(
+            "/bookings/hold",
+            headers=user_headers,
+            json={"event_name": event_one["name"], "seats": 1},
+        )
+        assert response.status_code == 201
+
+        response = await client.get("/events", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        await client.delete("/users/delete_me", headers=user_headers)
+    finally:
+        await client.delete("/events/delete", params=params, headers=headers)
@@ -0,0 +1,69 @@
+# tests/test_security.py
+import asyncio
+
+import jwt
+import pytest
+
+from reservations import security
+from reservations.security import HashingOverloadedError, PasswordHasher
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_workers", [0, 1])
+async def test_password_hasher_hash_and_verify(max_workers):
+    hasher = PasswordHasher(max_workers=max_workers, max_pending=4)
+    try:
+        hashed = await hasher.hash("secret")
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("not-secret", hashed)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_refuses_jobs_over_max_pending():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    try:
+        results = await asyncio.gather(
+            hasher.hash("first"), hasher.hash("second"), return_exceptions=True
+        )
+        assert isinstance(results[0], str)
+        assert isinstance(results[1], HashingOverloadedError)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.fixture
+def empty_token_cache():
+    security.token_cache.clear()
+    yield security.token_cache
+    security.token_cache.clear()
+
+
+def test_decode_access_token_verifies_once(monkeypatch, empty_token_cache):
+    token = security.create_access_token({"sub": "maria@example.com"})
+    calls = []
+    verify = security.verify_access_token
+    monkeypatch.setattr(
+        security, "verify_access_token", lambda t: calls.append(t) or verify(t)  # noqa B023
+    )
+
+    first = security.decode_access_token(token)
+    first["sub"] = "altered"
+    second = security.decode_access_token(token)
+
+    assert calls == [token]
+    assert second["sub"] == "maria@example.com"
+    assert len(empty_token_cache) == 1
+
+
+def test_decode_access_token_rejects_tampered_token(empty_token_cache):
+    token = security.create_access_token({"sub": "maria@example.com"})
+    security.decode_access_token(token)
+
+    forged = jwt.encode(jwt.decode(token, options={"verify_signature": False}), "forged-key")
+    with pytest.raises(jwt.InvalidSignatureError):
+        security.decode_access_token(forged)
+    assert len(empty_token_cache) == 1
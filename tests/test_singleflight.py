@@ -0,0 +1,95 @@
+# tests/test_singleflight.py
+import asyncio
+
+import pytest
+
+from pyutils import SingleFlight
+
+
+class Lookup:
+    """A slow call that counts how many times it ran."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_call():
+    flight = SingleFlight()
+    lookup = Lookup(result={"name": "event"})
+
+    callers = [asyncio.create_task(flight.do("event", lookup)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flight) == 1
+    lookup.release.set()
+
+    results = await asyncio.gather(*callers)
+    assert lookup.runs == 1
+    assert all(result is results[0] for result in results)
+    assert (flight.calls, flight.coalesced) == (1, 4)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_do_not_share():
+    flight = SingleFlight()
+    first, second = Lookup(result=1), Lookup(result=2)
+    first.release.set()
+    second.release.set()
+
+    assert await asyncio.gather(flight.do("a", first), flight.do("b", second)) == [1, 2]
+    assert (first.runs, second.runs) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared():
+    flight = SingleFlight()
+    lookup = Lookup(error=ValueError("boom"))
+
+    callers = [asyncio.create_task(flight.do("event", lookup)) for _ in range(3)]
+    await asyncio.sleep(0)
+    lookup.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert lookup.runs == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    lookup = Lookup(result="done")
+
+    first = asyncio.create_task(flight.do("event", lookup))
+    second = asyncio.create_task(flight.do("event", lookup))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    lookup.release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert lookup.runs == 1
+
+
+@pytest.mark.asyncio
+async def test_key_is_free_once_the_call_is_over():
+    flight = SingleFlight()
+    lookup = Lookup(result="done")
+    lookup.release.set()
+
+    await flight.do("event", lookup)
+    await flight.do("event", lookup)
+    assert lookup.runs == 2
+    assert flight.coalesced == 0
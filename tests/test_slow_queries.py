@@ -0,0 +1,93 @@
+# tests/test_slow_queries.py
+import json
+import logging
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from pyutils.logging import SlowQueryLog, configure_loggers
+
+
+class Lines(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://")
+
+    @event.listens_for(eng, "connect")
+    def add_sleep(dbapi_connection, _connection_record):
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+    try:
+        yield eng
+    finally:
+        eng.dispose()
+
+
+@pytest.fixture
+def slow_log():
+    handler = Lines()
+    logger = logging.getLogger("tests.slow_queries")
+    logger.addHandler(handler)
+    level, logger.level = logger.level, logging.INFO
+    try:
+        yield handler.lines
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+def test_only_slow_statements_are_logged(engine, slow_log):
+    slow_queries = SlowQueryLog(threshold_seconds=0.02, logger_name="tests.slow_queries")
+    slow_queries.register(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        for ms in (30, 40):
+            conn.execute(text("SELECT sleep_ms(:ms), :label"), {"ms": ms, "label": "x"})
+
+    assert [line["fingerprint"] for line in slow_log] == ["SELECT sleep_ms(?), ?"] * 2
+    first, second = slow_log
+    assert first["params"] == 2 and first["elapsed_ms"] >= 30
+    assert (first["count"], second["count"]) == (1, 2)
+    assert second["total_ms"] == pytest.approx(first["elapsed_ms"] + second["elapsed_ms"], abs=0.02)
+
+
+def test_summary_orders_fingerprints_by_total_time(engine, slow_log):
+    slow_queries = SlowQueryLog(threshold_seconds=0.0, logger_name="tests.slow_queries")
+    slow_queries.register(engine)
+    # Overlapping registrations time a statement once
+    slow_queries.register(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT sleep_ms(20)"))
+
+    assert len(slow_log) == 2
+    summary = slow_queries.summary()
+    assert [entry["fingerprint"] for entry in summary] == ["SELECT sleep_ms(?)", "SELECT ?"]
+    assert summary[0]["count"] == 1 and summary[0]["max_ms"] >= 20
+
+    slow_queries.log_summary()
+    assert slow_log[-1] == {"slow_queries": summary}
+
+
+def test_fast_statements_write_nothing(engine, slow_log, capsys):
+    configure_loggers(directory="configurations", filename="logger_config.yaml")
+    slow_queries = SlowQueryLog(threshold_seconds=0.1, logger_name="tests.slow_queries")
+    slow_queries.register(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert not logging.getLogger("sqlalchemy.engine.Engine").isEnabledFor(logging.INFO)
+    assert slow_log == [] and slow_queries.stats == {}
+    assert capsys.readouterr().out == ""
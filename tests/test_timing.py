@@ -0,0 +1,114 @@
+# tests/test_timing.py
+import json
+import logging
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from models.responses import Page
+from pyutils.timing import Timings, current_timings, time_statements, timed
+from reservations.rendering import ModelResponse
+from reservations.timing import ServerTimingMiddleware
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest_asyncio.fixture
+async def engine():
+    eng = create_async_engine("sqlite+aiosqlite://")
+    time_statements(eng.sync_engine)
+    try:
+        yield eng
+    finally:
+        await eng.dispose()
+
+
+def make_app(engine, sample_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, sample_rate=sample_rate)
+
+    @app.get("/work", response_model=Page[int])
+    async def work() -> ModelResponse:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                await conn.execute(text("SELECT 1"))
+        return ModelResponse(Page[int](items=[1, 2, 3]))
+
+    return app
+
+
+class Lines(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture
+def timing_log():
+    handler = Lines()
+    logger = logging.getLogger("reservations.timing")
+    logger.addHandler(handler)
+    level, logger.level = logger.level, logging.INFO
+    try:
+        yield handler.lines
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+def test_timings_accumulate_by_phase():
+    timings = Timings()
+    timings.add("db", 0.002)
+    timings.add("db", 0.001)
+    timings.add("hash", 0.05)
+
+    assert timings.as_dict() == {"db_ms": 3.0, "db_count": 2, "hash_ms": 50.0, "hash_count": 1}
+    assert timings.server_timing() == 'db;dur=3.00;desc="2x", hash;dur=50.00;desc="1x"'
+
+
+def test_timed_records_into_the_current_timings_only():
+    with timed("hash"):
+        pass  # nothing to record into
+
+    timings = Timings()
+    token = current_timings.set(timings)
+    try:
+        with timed("hash"):
+            pass
+    finally:
+        current_timings.reset(token)
+    assert timings.counts == {"hash": 1}
+
+
+@pytest.mark.asyncio
+async def test_sampled_request_gets_a_server_timing_header(engine, timing_log):
+    transport = ASGITransport(app=make_app(engine, sample_rate=1.0))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/work")
+
+    assert response.status_code == 200
+    phases = {phase.split(";")[0]: phase for phase in response.headers["server-timing"].split(", ")}
+    assert set(phases) == {"app", "db", "serialize"}
+    assert phases["db"].endswith('desc="3x"')
+
+    [line] = timing_log
+    assert line["path"] == "/work" and line["status"] == 200
+    assert line["db_count"] == 3 and line["serialize_count"] == 1
+    assert line["total_ms"] >= line["db_ms"]
+
+
+@pytest.mark.asyncio
+async def test_unsampled_request_is_not_timed(engine, timing_log):
+    transport = ASGITransport(app=make_app(engine, sample_rate=0.0))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/work")
+
+    assert "server-timing" not in response.headers
+    assert timing_log == []
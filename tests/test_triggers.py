@@ -1,32 +1,10 @@
 # tests/test_deletions.py
-import pytest
 import sqlalchemy as sa
 
 from configs import DBConfig
 from database.schema import BookingORM, EventORM
 
 
-def test_check_seats_before_insert(session, populated_db):
-    # Arrange (No cancellation for the event with id=1)
-    available_seats = session.execute(
-        sa.select((EventORM.total_seats - EventORM.reserved_seats).label("available_seats")).where(
-            EventORM.id_ == 1
-        )
-    ).scalar_one()
-
-    prev_booking = (
-        session.execute(sa.select(BookingORM).where(BookingORM.event_id == 1)).scalars().first()
-    )
-
-    new_booking = BookingORM.from_attributes(prev_booking)
-    new_booking.seats = available_seats + 1  # force overbooking
-
-    # Act & Assert
-    with pytest.raises(sa.exc.OperationalError, match="Not enough available seats for this event."):
-        session.add(new_booking)
-        session.flush()
-
-
 def test_increment_and_decrement_reserved_seats_after_insert(session, populated_db, events_orm):
     # Arrange
     reserved_seats_before = sorted(